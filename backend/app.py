@@ -1,30 +1,84 @@
+from typing import List
 from flask import Flask
 from flask_cors import CORS
 
 from config.database import DatabaseConfig, DatabaseConnection
+from config.replication import ReplicaSet
+from config.profiling import ProfilingConfig
 from repositories.task_repository import TaskRepository
+from repositories.shard_router import ShardRouter
 from services.task_service import TaskService
-from controllers.task_controller import TaskController
+from services.analytics_service import TaskAnalyticsService
+from services.due_date_scheduler import DueDateScheduler
+from services.request_profiler import RequestProfiler
+from controllers.task_controller import TaskController, SESSION_HEADER
+from controllers.profile_controller import ProfileController
+
+
+def build_repository(config: DatabaseConfig, connections: List[DatabaseConnection]) -> TaskRepository:
+    # The initial connect keeps its retry loop so startup can wait for MySQL; afterwards every
+    # query goes through the connection's circuit breaker and fails fast during an outage
+    primary = DatabaseConnection(config, use_breaker=True)
+    primary.connect()
+    connections.append(primary)
+    
+    replica_configs = config.replica_configs()
+    if not replica_configs:
+        return TaskRepository(primary)
+    
+    replicas = [DatabaseConnection(replica_config, use_breaker=True) for replica_config in replica_configs]
+    connections.extend(replicas)
+    return TaskRepository(primary, ReplicaSet(primary, replicas))
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
-    CORS(app)
+    # The frontend is served from another origin and has to read the session token back
+    CORS(app, expose_headers=[SESSION_HEADER])
     
-    db_config = DatabaseConfig()
-    db_connection = DatabaseConnection(db_config)
-    db = db_connection.connect()
+    # Profiling hooks are only installed when a token or sample rate is configured
+    profiling_config = ProfilingConfig()
+    if profiling_config.enabled:
+        app.register_blueprint(ProfileController(RequestProfiler(profiling_config)).blueprint)
     
-    task_repository = TaskRepository(db)
-    task_service = TaskService(task_repository)
-    task_controller = TaskController(task_service)
+    connections: List[DatabaseConnection] = []
+    shard_configs = DatabaseConfig.shard_configs()
+    if shard_configs:
+        task_repository = ShardRouter({
+            config.name: build_repository(config, connections)
+            for config in shard_configs
+        })
+    else:
+        task_repository = build_repository(DatabaseConfig(), connections)
+    
+    scheduler = DueDateScheduler()
+    scheduler.load(task_repository.iter_scheduled())
+    scheduler.add_listener(
+        lambda event: print(f"Task {event['task_id']} of {event['owner_id']} is {event['type']} ({event['due_date']})")
+    )
+    scheduler.start()
+    
+    task_service = TaskService(task_repository, scheduler)
+    analytics_service = TaskAnalyticsService(task_repository)
+    task_controller = TaskController(task_service, analytics_service)
     
     app.register_blueprint(task_controller.blueprint)
     
     @app.route('/health', methods=['GET'])
     def health_check():
+        if not all(connection.is_available() for connection in connections):
+            return {'status': 'degraded', 'service': 'todo-api'}, 503
         return {'status': 'healthy', 'service': 'todo-api'}, 200
     
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return {
+            'circuit_breakers': {
+                connection.breaker.name: connection.breaker.metrics()
+                for connection in connections if connection.breaker is not None
+            }
+        }, 200
+    
     return app
 
 
@@ -0,0 +1,95 @@
+"""Benchmark for GET /tasks/analytics over a large owner.
+
+Builds the columnar snapshot for N synthetic tasks from an in-memory stand-in
+repository, then times the analytics computation and an incremental refresh
+that only pulls the rows changed since the last snapshot.
+    
+    python benchmarks/bench_analytics.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.analytics_service import TaskAnalyticsService, SNAPSHOT_COLUMNS
+
+
+class StandInRepository:
+    
+    def __init__(self, rows: int, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        start = datetime(2023, 1, 1)
+        created_offsets = np.sort(rng.integers(0, 365 * 24 * 3600, rows))
+        completed = rng.random(rows) < 0.6
+        completion_hours = rng.exponential(48, rows)
+        has_due_date = rng.random(rows) < 0.5
+        due_offsets = rng.integers(-7, 30, rows)
+        priorities = np.array(['low', 'normal', 'urgent'])[rng.integers(0, 3, rows)]
+        
+        self.tasks = {}
+        for index in range(rows):
+            created_at = start + timedelta(seconds=int(created_offsets[index]))
+            completed_at = created_at + timedelta(hours=float(completion_hours[index])) if completed[index] else None
+            self.tasks[index + 1] = {
+                'id': index + 1,
+                'completed': int(completed[index]),
+                'priority': priorities[index],
+                'due_date': created_at + timedelta(days=int(due_offsets[index])) if has_due_date[index] else None,
+                'created_at': created_at,
+                'updated_at': completed_at or created_at,
+                'completed_at': completed_at,
+            }
+    
+    def find_updated_since(self, owner_id, since=None):
+        return [
+            [task[column] for column in SNAPSHOT_COLUMNS]
+            for task in self.tasks.values()
+            if since is None or task['updated_at'] >= since
+        ]
+    
+    def count_all(self, owner_id):
+        return len(self.tasks)
+    
+    def find_ids(self, owner_id):
+        return list(self.tasks)
+    
+    def touch(self, count: int, now: datetime):
+        for task_id in list(self.tasks)[:count]:
+            self.tasks[task_id].update(completed=1, completed_at=now, updated_at=now)
+
+
+def timed(label: str, callback):
+    start = time.perf_counter()
+    result = callback()
+    print(f"  {label}: {(time.perf_counter() - start) * 1000:,.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--changed', type=int, default=1000)
+    args = parser.parse_args()
+    
+    print(f"generating {args.rows:,} tasks...")
+    repository = StandInRepository(args.rows)
+    analytics = TaskAnalyticsService(repository)
+    now = datetime(2024, 1, 15)
+    
+    print(f"rows={args.rows:,}")
+    timed("initial snapshot + analytics", lambda: analytics.get_analytics(now=now))
+    for bucket in ('day', 'week', 'month'):
+        timed(f"analytics, bucket={bucket} (no changes)", lambda: analytics.get_analytics(bucket=bucket, now=now))
+    
+    repository.touch(args.changed, now)
+    timed(f"incremental refresh of {args.changed:,} changed rows + analytics",
+          lambda: analytics.get_analytics(now=now))
+
+
+if __name__ == '__main__':
+    main()
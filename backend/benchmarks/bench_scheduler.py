@@ -0,0 +1,78 @@
+"""Memory and per-mutation cost of the in-process due-date scheduler.
+
+Loads N scheduled tasks into DueDateScheduler, reports the traced memory of the
+heap and index, then times schedule/reschedule/unschedule and draining a batch
+of due events.
+    
+    python benchmarks/bench_scheduler.py --tasks 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.due_date_scheduler import DueDateScheduler
+
+
+def per_operation(label: str, operations: int, callback):
+    start = time.perf_counter()
+    for index in range(operations):
+        callback(index)
+    elapsed = time.perf_counter() - start
+    print(f"  {label}: {elapsed / operations * 1e6:.2f} us/op ({operations:,} ops)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--operations', type=int, default=100_000)
+    parser.add_argument('--owners', type=int, default=10_000)
+    args = parser.parse_args()
+    
+    rng = random.Random(7)
+    now = datetime(2024, 1, 1)
+    clock_now = now.timestamp()
+    scheduler = DueDateScheduler(reminder_lead=timedelta(hours=24), clock=lambda: clock_now)
+    
+    owners = [f"user-{index}" for index in range(args.owners)]
+    tasks = [
+        (owners[task_id % args.owners], task_id, now + timedelta(minutes=rng.randint(1, 60 * 24 * 90)))
+        for task_id in range(1, args.tasks + 1)
+    ]
+    
+    tracemalloc.start()
+    start = time.perf_counter()
+    scheduler.load(tasks)
+    load_seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    
+    print(f"tasks={len(scheduler):,}")
+    print(f"  load: {load_seconds:.2f}s")
+    print(f"  memory: {current / 1e6:.1f} MB ({current / len(scheduler):.0f} bytes/task)")
+    
+    due_dates = [now + timedelta(minutes=rng.randint(1, 60 * 24 * 90)) for _ in range(args.operations)]
+    task_ids = [rng.randint(1, args.tasks) for _ in range(args.operations)]
+    
+    per_operation("reschedule existing task", args.operations,
+                  lambda i: scheduler.schedule(owners[task_ids[i] % args.owners], task_ids[i], due_dates[i]))
+    per_operation("schedule new task", args.operations,
+                  lambda i: scheduler.schedule('new-owner', args.tasks + i + 1, due_dates[i]))
+    per_operation("unschedule task", args.operations,
+                  lambda i: scheduler.unschedule(owners[task_ids[i] % args.owners], task_ids[i]))
+    print(f"  heap entries after mutations: {len(scheduler._heap):,} for {len(scheduler):,} live tasks")
+    
+    start = time.perf_counter()
+    events = scheduler.pop_due(clock_now + timedelta(days=1).total_seconds())
+    elapsed = time.perf_counter() - start
+    print(f"  drain first day: {len(events):,} events in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
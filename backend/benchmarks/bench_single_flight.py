@@ -0,0 +1,88 @@
+"""Thundering-herd benchmark for TaskService read coalescing.
+
+Fires N simultaneous GET /tasks-equivalent calls (TaskService.get_all_tasks and
+get_task_statistics) at a stand-in repository that takes a fixed time per query,
+with and without single-flight coalescing, and reports how many queries reached
+the repository.
+    
+    python benchmarks/bench_single_flight.py --clients 200
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.task_service import TaskService
+
+
+class StandInRepository:
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.queries = 0
+        self._lock = threading.Lock()
+    
+    def _query(self, result):
+        with self._lock:
+            self.queries += 1
+        time.sleep(self.latency)
+        return result
+    
+    def find_all(self, owner_id):
+        return self._query([{'id': 1, 'title': 'Task'}])
+    
+    def count_all(self, owner_id):
+        return self._query(1)
+    
+    def count_by_status(self, completed, owner_id):
+        return self._query(0)
+
+
+class NoCoalescing:
+    
+    def do(self, scope, key, loader):
+        return loader()
+    
+    def invalidate(self, scope):
+        pass
+
+
+def herd(clients: int, latency: float, coalesce: bool, call: str):
+    repository = StandInRepository(latency)
+    service = TaskService(repository) if coalesce else TaskService(repository, single_flight=NoCoalescing())
+    target = getattr(service, call)
+    barrier = threading.Barrier(clients)
+    
+    def client():
+        barrier.wait()
+        target()
+    
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    label = 'coalesced' if coalesce else 'direct'
+    print(f"  {call:<20} {label:<10} queries={repository.queries:<5} wall={elapsed * 1000:,.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per stand-in query')
+    args = parser.parse_args()
+    
+    print(f"clients={args.clients} latency={args.latency * 1000:.0f} ms/query")
+    for call in ('get_all_tasks', 'get_task_statistics'):
+        for coalesce in (False, True):
+            herd(args.clients, args.latency, coalesce, call)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Export/import round-trip benchmark for the streaming transfer endpoints.
+
+Runs the same code path as GET /tasks/export and POST /tasks/import against an
+in-memory stand-in repository, so it measures the Python-side cost (encoding,
+parsing, validation, chunking) and peak memory without a MySQL server.
+    
+    python benchmarks/bench_transfer.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.task_service import TaskService
+from services import task_transfer
+
+
+class StandInRepository:
+    
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.inserted = 0
+    
+    def iter_all(self, owner_id, batch_size=1000):
+        created = datetime(2024, 1, 1)
+        for task_id in range(1, self.rows + 1):
+            yield {
+                'id': task_id,
+                'title': f"Task {task_id}",
+                'description': 'Imported from benchmark',
+                'completed': task_id % 3 == 0,
+                'priority': ('low', 'normal', 'urgent')[task_id % 3],
+                'due_date': created + timedelta(days=task_id % 30) if task_id % 2 else None,
+                'created_at': created,
+                'updated_at': created,
+            }
+    
+    def bulk_create(self, rows, owner_id):
+        first_id = self.inserted + 1
+        self.inserted += len(rows)
+        return list(range(first_id, self.inserted + 1))
+
+
+def run(rows: int, transfer_format: str, trace_memory: bool):
+    repository = StandInRepository(rows)
+    service = TaskService(repository)
+    writer = task_transfer.write_csv if transfer_format == 'csv' else task_transfer.write_ndjson
+    reader = task_transfer.read_csv if transfer_format == 'csv' else task_transfer.read_ndjson
+    
+    if trace_memory:
+        tracemalloc.start()
+    
+    with tempfile.TemporaryFile('w+', encoding='utf-8', newline='') as spool:
+        start = time.perf_counter()
+        for chunk in writer(service.export_tasks()):
+            spool.write(chunk)
+        export_seconds = time.perf_counter() - start
+        size = spool.tell()
+        
+        spool.seek(0)
+        start = time.perf_counter()
+        summary = None
+        for event in service.import_tasks(reader(spool)):
+            summary = event
+        import_seconds = time.perf_counter() - start
+    
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    
+    print(f"format={transfer_format} rows={rows} size={size / 1e6:.1f} MB")
+    print(f"  export: {export_seconds:.2f}s ({rows / export_seconds:,.0f} rows/s)")
+    print(f"  import: {import_seconds:.2f}s ({rows / import_seconds:,.0f} rows/s) "
+          f"imported={summary['imported']} failed={summary['failed']}")
+    if peak is not None:
+        print(f"  peak traced memory: {peak / 1e6:.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--format', choices=sorted(task_transfer.FORMATS), action='append')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='report peak Python memory (tracemalloc slows the run considerably)')
+    args = parser.parse_args()
+    
+    for transfer_format in args.format or ['csv', 'ndjson']:
+        run(args.rows, transfer_format, args.trace_memory)
+
+
+if __name__ == '__main__':
+    main()
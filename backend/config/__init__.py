@@ -1,4 +1,8 @@
 """Configuration package."""
 from .database import DatabaseConfig, DatabaseConnection
+from .circuit_breaker import CircuitBreaker, DatabaseUnavailableError
+from .replication import ReplicaSet, session_token
+from .profiling import ProfilingConfig
 
-__all__ = ['DatabaseConfig', 'DatabaseConnection']
+__all__ = ['DatabaseConfig', 'DatabaseConnection', 'CircuitBreaker', 'DatabaseUnavailableError',
+           'ReplicaSet', 'session_token', 'ProfilingConfig']
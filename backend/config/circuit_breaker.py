@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class DatabaseUnavailableError(Exception):
+    
+    def __init__(self, message: str, retry_after: float = 5.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    # closed:    calls go through; consecutive failures are counted
+    # open:      calls fail fast; one background thread waits reset_timeout, then probes
+    # half_open: the probe is running; calls still fail fast until it succeeds
+    
+    def __init__(self, name: str, probe: Callable[[], Any],
+                 is_failure: Callable[[BaseException], bool] = lambda e: True,
+                 failure_threshold: int = 3, reset_timeout: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.probe = probe
+        self.is_failure = is_failure
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.rejected_calls = 0
+        self.transitions: Counter = Counter()
+        self.last_transition_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._probe_thread: Optional[threading.Thread] = None
+    
+    def _transition(self, state: str):
+        # Caller holds self._lock
+        if state == self.state:
+            return
+        self.transitions[f"{self.state}->{state}"] += 1
+        print(f"Circuit '{self.name}' {self.state} -> {state}")
+        self.state = state
+        self.last_transition_at = self.clock()
+    
+    def allow_request(self) -> bool:
+        return self.state == CLOSED
+    
+    def before_call(self):
+        if self.state != CLOSED:
+            with self._lock:
+                self.rejected_calls += 1
+            raise DatabaseUnavailableError(f"Database '{self.name}' is unavailable, try again later",
+                                           retry_after=self.reset_timeout)
+    
+    def record_success(self):
+        if self.consecutive_failures:
+            with self._lock:
+                self.consecutive_failures = 0
+    
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state != CLOSED or self.consecutive_failures < self.failure_threshold:
+                return
+            self._transition(OPEN)
+            self._start_probe()
+    
+    def call(self, fn: Callable[[], Any], counts_as_success: bool = True) -> Any:
+        self.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure()
+            raise
+        if counts_as_success:
+            self.record_success()
+        return result
+    
+    def _start_probe(self):
+        # Caller holds self._lock; at most one probe thread exists per breaker
+        if self._probe_thread is not None:
+            return
+        self._wake.clear()
+        self._probe_thread = threading.Thread(target=self._probe_loop, name=f"circuit-probe-{self.name}",
+                                              daemon=True)
+        self._probe_thread.start()
+    
+    def _probe_loop(self):
+        while True:
+            self._wake.wait(self.reset_timeout)
+            self._wake.clear()
+            with self._lock:
+                self._transition(HALF_OPEN)
+            try:
+                self.probe()
+            except Exception as e:
+                print(f"Circuit '{self.name}' probe failed: {e}")
+                with self._lock:
+                    self._transition(OPEN)
+                continue
+            with self._lock:
+                self.consecutive_failures = 0
+                self._transition(CLOSED)
+                self._probe_thread = None
+            return
+    
+    def probe_now(self):
+        self._wake.set()
+    
+    def wait_for_probe(self, timeout: Optional[float] = None) -> bool:
+        thread = self._probe_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+    
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'rejected_calls': self.rejected_calls,
+                'transitions': dict(self.transitions),
+                'seconds_since_transition': (
+                    None if self.last_transition_at is None
+                    else round(self.clock() - self.last_transition_at, 3)
+                ),
+            }
@@ -1,27 +1,140 @@
 import mysql.connector
 from mysql.connector import MySQLConnection
+from mysql.connector import errors
+import threading
 import time
 import os
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from .circuit_breaker import CircuitBreaker
+
+
+# Client error codes meaning the server could not be reached or the connection dropped
+CONNECTION_ERRNOS = {2002, 2003, 2005, 2006, 2013, 2055}
 
 
 class DatabaseConfig:
     
-    def __init__(self):
-        self.host = os.getenv('DB_HOST', 'mysql_db')
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 database: Optional[str] = None, name: str = 'default'):
+        self.name = name
+        self.host = host or os.getenv('DB_HOST', 'mysql_db')
         self.user = os.getenv('DB_USER', 'root')
         self.password = os.getenv('DB_PASSWORD', 'root')
-        self.database = os.getenv('DB_NAME', 'todo_db')
-        self.port = int(os.getenv('DB_PORT', '3306'))
+        self.database = database or os.getenv('DB_NAME', 'todo_db')
+        self.port = port or int(os.getenv('DB_PORT', '3306'))
+        self.connect_timeout = int(os.getenv('DB_CONNECT_TIMEOUT', '3'))
+        # The driver drops connect_timeout once the handshake is done; these bound every
+        # query afterwards, so a hung server raises instead of blocking the request
+        self.read_timeout = int(os.getenv('DB_READ_TIMEOUT', '30'))
+        self.write_timeout = int(os.getenv('DB_WRITE_TIMEOUT', '30'))
+        self.autocommit = False
+        self.breaker_failure_threshold = int(os.getenv('DB_BREAKER_FAILURES', '3'))
+        self.breaker_reset_timeout = float(os.getenv('DB_BREAKER_RESET_SECONDS', '5'))
+    
+    @staticmethod
+    def shard_configs() -> List['DatabaseConfig']:
+        # DB_SHARDS="name=host:port/database,..."; port and database are optional
+        spec = os.getenv('DB_SHARDS', '').strip()
+        if not spec:
+            return []
+        
+        configs = []
+        for entry in spec.split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            name, _, address = entry.partition('=')
+            if not address:
+                raise ValueError(f"Invalid shard definition '{entry}', expected name=host[:port][/database]")
+            address, _, database = address.partition('/')
+            host, _, port = address.partition(':')
+            configs.append(DatabaseConfig(host=host, port=int(port) if port else None,
+                                          database=database or None, name=name.strip()))
+        return configs
+    
+    def replica_configs(self) -> List['DatabaseConfig']:
+        # DB_REPLICAS for the default database, DB_<NAME>_REPLICAS for a named shard;
+        # both take "host:port,host:port" and share this database's credentials and schema
+        env_key = 'DB_REPLICAS' if self.name == 'default' else f"DB_{self.name.upper()}_REPLICAS"
+        spec = os.getenv(env_key, '').strip()
+        
+        configs = []
+        for index, address in enumerate(entry.strip() for entry in spec.split(',')):
+            if not address:
+                continue
+            host, _, port = address.partition(':')
+            replica = DatabaseConfig(host=host, port=int(port) if port else self.port,
+                                     database=self.database, name=f"{self.name}-replica{index}")
+            replica.user = self.user
+            replica.password = self.password
+            # Replicas only serve SELECTs and never commit; without autocommit each connection
+            # would stay in one REPEATABLE READ transaction and keep returning its first snapshot
+            replica.autocommit = True
+            configs.append(replica)
+        return configs
+
+
+def is_connection_error(error: BaseException) -> bool:
+    if isinstance(error, (errors.InterfaceError, errors.OperationalError,
+                          errors.ReadTimeoutError, errors.WriteTimeoutError)):
+        return True
+    return getattr(error, 'errno', None) in CONNECTION_ERRNOS
+
+
+class GuardedCursor:
+    # Cursor wrapper that runs queries through the owning connection, so connection failures
+    # mark it broken and are counted by the circuit breaker
+    
+    def __init__(self, cursor, call: Callable[[Callable[[], Any]], Any]):
+        self._cursor = cursor
+        self._call = call
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+    
+    def __iter__(self):
+        return iter(self._cursor)
+    
+    def execute(self, *args, **kwargs):
+        return self._call(lambda: self._cursor.execute(*args, **kwargs))
+    
+    def executemany(self, *args, **kwargs):
+        return self._call(lambda: self._cursor.executemany(*args, **kwargs))
+    
+    def fetchone(self):
+        return self._call(self._cursor.fetchone)
+    
+    def fetchmany(self, *args, **kwargs):
+        return self._call(lambda: self._cursor.fetchmany(*args, **kwargs))
+    
+    def fetchall(self):
+        return self._call(self._cursor.fetchall)
 
 
 class DatabaseConnection:
+    # The connection is never pinged on the request path: a dropped connection shows up as a
+    # failing execute/fetch/commit, which marks it broken, and the next cursor() reconnects
     
-    def __init__(self, config: DatabaseConfig, max_retries: int = 5, retry_delay: int = 5):
+    def __init__(self, config: DatabaseConfig, max_retries: int = 5, retry_delay: int = 5,
+                 use_breaker: bool = False):
         self.config = config
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self._connection: Optional[MySQLConnection] = None
+        self._broken = False
+        self._reconnect_lock = threading.Lock()
+        # Connection the current thread's last cursor was opened on; commit() only ever uses it
+        self._local = threading.local()
+        self.breaker: Optional[CircuitBreaker] = None
+        if use_breaker:
+            self.breaker = CircuitBreaker(
+                name=config.name if config.name != 'default' else config.host,
+                probe=self._probe,
+                is_failure=is_connection_error,
+                failure_threshold=config.breaker_failure_threshold,
+                reset_timeout=config.breaker_reset_timeout,
+            )
     
     def connect(self) -> MySQLConnection:
         retries = self.max_retries
@@ -29,13 +142,8 @@ class DatabaseConnection:
         
         while retries > 0:
             try:
-                self._connection = mysql.connector.connect(
-                    host=self.config.host,
-                    user=self.config.user,
-                    password=self.config.password,
-                    database=self.config.database,
-                    port=self.config.port
-                )
+                self._connection = mysql.connector.connect(**self._connect_args())
+                self._broken = False
                 print(f"Successfully connected to database at {self.config.host}")
                 return self._connection
             except mysql.connector.Error as err:
@@ -51,10 +159,96 @@ class DatabaseConnection:
             error_msg += f": {last_error}"
         raise Exception(error_msg)
     
+    def _connect_args(self) -> Dict[str, Any]:
+        return {
+            'host': self.config.host,
+            'user': self.config.user,
+            'password': self.config.password,
+            'database': self.config.database,
+            'port': self.config.port,
+            'connection_timeout': self.config.connect_timeout,
+            'read_timeout': self.config.read_timeout,
+            'write_timeout': self.config.write_timeout,
+            'autocommit': self.config.autocommit,
+        }
+    
+    def _connect_once(self) -> MySQLConnection:
+        # Single attempt: used on the request path and by the breaker's probe, where the
+        # retry-and-sleep loop of connect() would stall the caller
+        return mysql.connector.connect(**self._connect_args())
+    
+    def _replace_connection(self, connection: MySQLConnection):
+        # Caller holds self._reconnect_lock
+        stale = self._connection
+        self._connection = connection
+        self._broken = False
+        if stale is not None and stale is not connection:
+            try:
+                stale.close()
+            except mysql.connector.Error:
+                pass
+    
+    def _probe(self):
+        connection = self._connect_once()
+        # Connecting alone doesn't prove a hung server is answering queries again
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+        finally:
+            cursor.close()
+        with self._reconnect_lock:
+            self._replace_connection(connection)
+    
+    def _current_connection(self) -> MySQLConnection:
+        connection = self._connection
+        if connection is not None and not self._broken:
+            return connection
+        with self._reconnect_lock:
+            # Another thread may already have replaced the broken connection
+            if self._connection is None or self._broken:
+                if self.breaker is not None:
+                    self._replace_connection(self._connect_once())
+                else:
+                    self.connect()
+            return self._connection
+    
+    def _call(self, fn: Callable[[], Any], counts_as_success: bool = True) -> Any:
+        try:
+            if self.breaker is not None:
+                return self.breaker.call(fn, counts_as_success)
+            return fn()
+        except Exception as e:
+            if is_connection_error(e):
+                self._broken = True
+            raise
+    
     def get_connection(self) -> MySQLConnection:
-        if self._connection is None or not self._connection.is_connected():
-            self.connect()
-        return self._connection
+        # A hung server still accepts connections, so only finished queries and commits
+        # reset the breaker's failure count; failing to connect still counts against it
+        return self._call(self._current_connection, counts_as_success=False)
+    
+    def is_available(self) -> bool:
+        return self.breaker is None or self.breaker.allow_request()
+    
+    def cursor(self, **kwargs):
+        connection = self.get_connection()
+        self._local.connection = connection
+        return GuardedCursor(connection.cursor(**kwargs), self._call)
+    
+    def commit(self):
+        # Never reconnects: committing on a fresh connection would silently drop the writes
+        # that were executed on the lost one
+        connection = getattr(self._local, 'connection', None) or self._connection
+        
+        def commit_on_cursor_connection():
+            if connection is None or connection is not self._connection:
+                raise errors.OperationalError(
+                    msg="Connection was lost before commit; the transaction was not committed", errno=2013
+                )
+            connection.commit()
+        
+        self._call(commit_on_cursor_connection)
     
     def close(self):
         if self._connection and self._connection.is_connected():
@@ -63,4 +257,6 @@ class DatabaseConnection:
     
     def reconnect(self) -> MySQLConnection:
         self.close()
-        return self.connect()
+        with self._reconnect_lock:
+            self._broken = True
+        return self.get_connection()
@@ -0,0 +1,22 @@
+import os
+import tempfile
+from typing import Optional
+
+
+class ProfilingConfig:
+    
+    def __init__(self, token: Optional[str] = None, sample_rate: Optional[float] = None,
+                 directory: Optional[str] = None, max_profiles: Optional[int] = None):
+        # PROFILE_TOKEN: requests sending it in X-Profile are profiled, and it guards /debug/profiles
+        # PROFILE_SAMPLE_RATE: fraction of all other requests to profile (0 disables sampling)
+        self.token = token if token is not None else os.getenv('PROFILE_TOKEN', '')
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+        self.directory = directory or os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'todo-profiles'))
+        self.max_profiles = max_profiles or int(os.getenv('PROFILE_MAX_COUNT', '100'))
+        
+        if not 0 <= self.sample_rate <= 1:
+            raise ValueError("PROFILE_SAMPLE_RATE must be between 0 and 1")
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token) or self.sample_rate > 0
@@ -0,0 +1,136 @@
+import itertools
+import math
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from .database import DatabaseConnection
+
+
+# Token of the current client session: the wall-clock time of its last write.
+# Set per request by the controller and refreshed by the repository after a commit.
+session_token: ContextVar[Optional[str]] = ContextVar('session_token', default=None)
+
+# Tokens are issued from the backends' own clocks; one further ahead than this clock skew
+# did not come from a write and is ignored rather than pinning the client to the primary
+MAX_TOKEN_SKEW_SECONDS = 5.0
+
+
+class ReplicaSet:
+    
+    def __init__(self, primary: DatabaseConnection, replicas: List[DatabaseConnection],
+                 max_lag_seconds: float = 5.0, health_check_interval: float = 5.0,
+                 lag_probe: Optional[Callable[[DatabaseConnection], Optional[float]]] = None):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag_seconds = max_lag_seconds
+        self.health_check_interval = health_check_interval
+        self.lag_probe = lag_probe or self.measure_lag
+        self._lag: Dict[int, Optional[float]] = {}
+        self._checked_at: Optional[float] = None
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+        self._probing = threading.Lock()
+    
+    @staticmethod
+    def measure_lag(replica: DatabaseConnection) -> Optional[float]:
+        cursor = replica.cursor(dictionary=True)
+        try:
+            cursor.execute("SHOW REPLICA STATUS")
+            status = cursor.fetchone()
+        finally:
+            cursor.close()
+        
+        if not status or status.get('Replica_IO_Running') != 'Yes' or status.get('Replica_SQL_Running') != 'Yes':
+            return None
+        lag = status.get('Seconds_Behind_Source')
+        return float(lag) if lag is not None else None
+    
+    def check_health(self) -> Dict[int, Optional[float]]:
+        lag = {}
+        for index, replica in enumerate(self.replicas):
+            try:
+                lag[index] = self.lag_probe(replica)
+            except Exception as e:
+                print(f"Replica health check failed for {replica.config.host}: {e}")
+                lag[index] = None
+        
+        with self._lock:
+            self._lag = lag
+            self._checked_at = time.monotonic()
+        return lag
+    
+    def _is_stale(self) -> bool:
+        checked_at = self._checked_at
+        return checked_at is None or time.monotonic() - checked_at >= self.health_check_interval
+    
+    def _refresh_health_if_stale(self):
+        # Only one request probes at a time; the others route on the last known lag meanwhile
+        if not self._is_stale() or not self._probing.acquire(blocking=False):
+            return
+        try:
+            if self._is_stale():
+                self.check_health()
+        finally:
+            self._probing.release()
+    
+    def record_write(self) -> str:
+        token = f"{time.time():.6f}"
+        session_token.set(token)
+        return token
+    
+    @staticmethod
+    def _written_at(token: Optional[str], now: float) -> Optional[float]:
+        if not token:
+            return None
+        try:
+            written_at = float(token)
+        except ValueError:
+            return None
+        if not math.isfinite(written_at) or written_at > now + MAX_TOKEN_SKEW_SECONDS:
+            return None
+        return min(written_at, now)
+    
+    def _candidates(self, token: Optional[str]) -> List[int]:
+        now = time.time()
+        written_at = self._written_at(token, now)
+        
+        # Seconds_Behind_Source is reported in whole seconds, so a replica is only trusted
+        # with a session's write once a full extra second has passed beyond its lag
+        since_write = now - written_at if written_at is not None else None
+        
+        candidates = []
+        for index, lag in self._lag.items():
+            if lag is None or lag > self.max_lag_seconds:
+                continue
+            if not self.replicas[index].is_available():
+                continue
+            if since_write is not None and since_write <= lag + 1.0:
+                continue
+            candidates.append(index)
+        return candidates
+    
+    def reader(self, token: Optional[str] = None) -> DatabaseConnection:
+        if not self.replicas:
+            return self.primary
+        
+        self._refresh_health_if_stale()
+        candidates = self._candidates(token)
+        if not candidates:
+            return self.primary
+        
+        return self.replicas[candidates[next(self._round_robin) % len(candidates)]]
+    
+    def writer(self) -> DatabaseConnection:
+        return self.primary
+    
+    def status(self) -> List[Dict[str, object]]:
+        return [
+            {
+                'host': replica.config.host,
+                'lag_seconds': self._lag.get(index),
+                'healthy': self._lag.get(index) is not None and self._lag[index] <= self.max_lag_seconds
+            }
+            for index, replica in enumerate(self.replicas)
+        ]
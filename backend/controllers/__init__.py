@@ -1,4 +1,5 @@
 """Controllers package."""
 from .task_controller import TaskController
+from .profile_controller import ProfileController
 
-__all__ = ['TaskController']
+__all__ = ['TaskController', 'ProfileController']
@@ -0,0 +1,91 @@
+from flask import Blueprint, Response, g, jsonify, request, send_file
+from services.request_profiler import RequestProfiler
+from typing import Tuple
+
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+
+
+class ProfileController:
+    # Only registered when profiling is configured, so the request hooks below cost nothing otherwise
+    
+    def __init__(self, profiler: RequestProfiler):
+        self.profiler = profiler
+        self.blueprint = Blueprint('profiles', __name__, url_prefix='/debug/profiles')
+        self._register_routes()
+    
+    def _register_routes(self):
+        self.blueprint.add_url_rule('', view_func=self.list_profiles, methods=['GET'])
+        self.blueprint.add_url_rule('/<profile_id>', view_func=self.get_profile, methods=['GET'])
+        self.blueprint.add_url_rule('/<profile_id>/download', view_func=self.download_profile, methods=['GET'])
+        self.blueprint.before_request(self._require_token)
+        self.blueprint.before_app_request(self._start_profile)
+        self.blueprint.after_app_request(self._finish_profile)
+        self.blueprint.teardown_app_request(self._abandon_profile)
+    
+    def _require_token(self):
+        if not self.profiler.is_privileged(request.headers.get(PROFILE_HEADER)):
+            return jsonify({'error': f"A valid {PROFILE_HEADER} header is required"}), 403
+    
+    def _start_profile(self):
+        if request.blueprint == self.blueprint.name:
+            return
+        trigger = self.profiler.select(request.headers.get(PROFILE_HEADER))
+        if trigger is not None:
+            run = self.profiler.start(trigger)
+            if run is not None:
+                g.profile_run = run
+    
+    def _finish_profile(self, response: Response) -> Response:
+        run = g.pop('profile_run', None)
+        if run is None:
+            return response
+        # Streamed bodies (e.g. /tasks/export) are produced after this point and are not included
+        summary = self.profiler.finish(run, request.method, request.path, response.status_code)
+        response.headers[PROFILE_ID_HEADER] = summary['id']
+        return response
+    
+    def _abandon_profile(self, error):
+        run = g.pop('profile_run', None)
+        if run is not None:
+            self.profiler.abandon(run)
+    
+    def list_profiles(self) -> Tuple:
+        try:
+            return jsonify(self.profiler.store.list_profiles()), 200
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    def get_profile(self, profile_id: str) -> Tuple:
+        try:
+            summary = self.profiler.store.get(profile_id)
+            if summary is None:
+                return jsonify({'error': 'Profile not found'}), 404
+            return jsonify(summary), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    def download_profile(self, profile_id: str):
+        try:
+            profile_format = request.args.get('format', 'pstats')
+            if profile_format == 'pstats':
+                path = self.profiler.store.stats_path(profile_id)
+                if path is None:
+                    return jsonify({'error': 'Profile not found'}), 404
+                return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                                 download_name=f"{profile_id}.pstats")
+            if profile_format == 'collapsed':
+                stacks = self.profiler.collapsed(profile_id)
+                if stacks is None:
+                    return jsonify({'error': 'Profile not found'}), 404
+                return Response(stacks, mimetype='text/plain', headers={
+                    'Content-Disposition': f'attachment; filename="{profile_id}.collapsed"'
+                })
+            return jsonify({'error': "format must be one of: pstats, collapsed"}), 400
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
@@ -1,12 +1,35 @@
-from flask import Blueprint, request, jsonify
+import io
+import itertools
+import json
+import math
+import re
+from datetime import timedelta
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from services.task_service import TaskService
-from typing import Tuple
+from services.analytics_service import TaskAnalyticsService
+from services import task_transfer
+from repositories.task_repository import DEFAULT_OWNER
+from repositories.task_record import TaskRecord, records_to_json
+from config.replication import session_token
+from config.circuit_breaker import DatabaseUnavailableError
+from typing import List, Optional, Tuple
+
+
+# Trusted as sent: it must be set by an authenticating proxy in front of the backend, which
+# also strips any value from the end user. Clients reaching the backend directly can act as any owner.
+OWNER_HEADER = 'X-Owner-Id'
+SESSION_HEADER = 'X-Session-Token'
+DURATION_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+# Upper bound for client-chosen export page and import chunk sizes: one import chunk is a single
+# multi-row INSERT held in memory and has to fit in max_allowed_packet
+MAX_TRANSFER_BATCH = 10000
 
 
 class TaskController:
     
-    def __init__(self, task_service: TaskService):
+    def __init__(self, task_service: TaskService, analytics_service: Optional[TaskAnalyticsService] = None):
         self.service = task_service
+        self.analytics = analytics_service or TaskAnalyticsService(task_service.repository)
         self.blueprint = Blueprint('tasks', __name__, url_prefix='/tasks')
         self._register_routes()
     
@@ -16,13 +39,48 @@ class TaskController:
         self.blueprint.add_url_rule('/<int:task_id>', view_func=self.update_task, methods=['PUT'])
         self.blueprint.add_url_rule('/<int:task_id>', view_func=self.delete_task, methods=['DELETE'])
         self.blueprint.add_url_rule('/stats', view_func=self.get_statistics, methods=['GET'])
+        self.blueprint.add_url_rule('/analytics', view_func=self.get_analytics, methods=['GET'])
+        self.blueprint.add_url_rule('/due', view_func=self.get_due_tasks, methods=['GET'])
+        self.blueprint.add_url_rule('/overdue', view_func=self.get_overdue_tasks, methods=['GET'])
+        self.blueprint.add_url_rule('/export', view_func=self.export_tasks, methods=['GET'])
+        self.blueprint.add_url_rule('/import', view_func=self.import_tasks, methods=['POST'])
+        self.blueprint.before_request(self._load_session)
+        self.blueprint.after_request(self._save_session)
+    
+    def _load_session(self):
+        session_token.set(request.headers.get(SESSION_HEADER) or None)
+    
+    def _save_session(self, response):
+        token = session_token.get()
+        if token:
+            response.headers[SESSION_HEADER] = token
+        return response
+    
+    def _server_error(self, error: Exception) -> Tuple:
+        if isinstance(error, DatabaseUnavailableError):
+            response = jsonify({'error': str(error)})
+            response.headers['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+            return response, 503
+        return jsonify({'error': str(error)}), 500
+    
+    def _task_list(self, tasks: List[TaskRecord]) -> Response:
+        # Records serialize themselves straight to JSON; no per-row dict is built for jsonify
+        return Response(records_to_json(tasks), mimetype='application/json')
+    
+    def _owner_id(self) -> str:
+        owner_id = request.headers.get(OWNER_HEADER, '').strip() or DEFAULT_OWNER
+        if len(owner_id) > 64:
+            raise ValueError(f"{OWNER_HEADER} must be 64 characters or less")
+        return owner_id
     
     def get_all_tasks(self):
         try:
-            tasks = self.service.get_all_tasks()
-            return jsonify(tasks), 200
+            tasks = self.service.get_all_tasks(self._owner_id())
+            return self._task_list(tasks), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return self._server_error(e)
     
     def create_task(self) -> Tuple:
         try:
@@ -36,13 +94,14 @@ class TaskController:
             priority = data.get('priority', 'normal')
             due_date = data.get('due_date')
             
-            task = self.service.create_task(title, description, priority, due_date)
+            task = self.service.create_task(title, description, priority, due_date,
+                                            owner_id=self._owner_id())
             return jsonify(task), 201
-            
+        
         except ValueError as e:
             return jsonify({'error': str(e)}), 400
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return self._server_error(e)
     
     def update_task(self, task_id: int) -> Tuple:
         try:
@@ -57,33 +116,139 @@ class TaskController:
             priority = data.get('priority')
             due_date = data.get('due_date')
             
-            task = self.service.update_task(task_id, title, description, completed, priority, due_date)
+            task = self.service.update_task(task_id, title, description, completed, priority, due_date,
+                                            owner_id=self._owner_id())
             
             if task is None:
                 return jsonify({'error': 'Task not found'}), 404
             
             return jsonify(task), 200
-            
+        
         except ValueError as e:
             return jsonify({'error': str(e)}), 400
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return self._server_error(e)
     
     def delete_task(self, task_id: int) -> Tuple:
         try:
-            success = self.service.delete_task(task_id)
+            success = self.service.delete_task(task_id, self._owner_id())
             
             if not success:
                 return jsonify({'error': 'Task not found'}), 404
             
             return jsonify({'message': 'Task deleted successfully'}), 200
-            
+        
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return self._server_error(e)
     
     def get_statistics(self) -> Tuple:
         try:
-            stats = self.service.get_task_statistics()
+            stats = self.service.get_task_statistics(self._owner_id())
             return jsonify(stats), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return self._server_error(e)
+    
+    def _parse_duration(self, value: str) -> timedelta:
+        # "90m", "12h", "7d"; a bare number is read as hours
+        match = re.fullmatch(r'(\d+)([mhd]?)', value.strip().lower())
+        if not match:
+            raise ValueError("within must look like 90m, 12h or 7d")
+        amount, unit = int(match.group(1)), match.group(2) or 'h'
+        within = timedelta(**{DURATION_UNITS[unit]: amount})
+        if within > timedelta(days=366):
+            raise ValueError("within must be at most 366 days")
+        return within
+    
+    def get_due_tasks(self) -> Tuple:
+        try:
+            within = self._parse_duration(request.args.get('within', '24h'))
+            tasks = self.service.get_due_tasks(within, self._owner_id())
+            return self._task_list(tasks), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return self._server_error(e)
+    
+    def get_overdue_tasks(self) -> Tuple:
+        try:
+            tasks = self.service.get_overdue_tasks(self._owner_id())
+            return self._task_list(tasks), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return self._server_error(e)
+    
+    def get_analytics(self) -> Tuple:
+        try:
+            analytics = self.analytics.get_analytics(self._owner_id(), request.args.get('bucket', 'day'))
+            return jsonify(analytics), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return self._server_error(e)
+    
+    def _transfer_format(self, default: str) -> str:
+        transfer_format = request.args.get('format')
+        if transfer_format is None:
+            content_type = (request.mimetype or '').lower()
+            transfer_format = next(
+                (name for name, mimetype in task_transfer.FORMATS.items() if mimetype == content_type),
+                default
+            )
+        if transfer_format not in task_transfer.FORMATS:
+            raise ValueError("Format must be 'csv' or 'ndjson'")
+        return transfer_format
+    
+    def export_tasks(self) -> Tuple:
+        try:
+            owner_id = self._owner_id()
+            transfer_format = self._transfer_format(default='ndjson')
+            batch_size = request.args.get('batch_size', 1000, type=int)
+            if batch_size < 1:
+                raise ValueError("batch_size must be a positive integer")
+            batch_size = min(batch_size, MAX_TRANSFER_BATCH)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        try:
+            # Pull the first row before answering, so a database outage becomes a 503 instead
+            # of an error raised mid-stream after the 200 headers have gone out
+            tasks = self.service.export_tasks(owner_id, batch_size)
+            first = next(tasks, None)
+        except Exception as e:
+            return self._server_error(e)
+        tasks = itertools.chain([first], tasks) if first is not None else iter(())
+        writer = task_transfer.write_csv if transfer_format == 'csv' else task_transfer.write_ndjson
+        
+        response = Response(stream_with_context(writer(tasks)),
+                            mimetype=task_transfer.FORMATS[transfer_format])
+        response.headers['Content-Disposition'] = f'attachment; filename=tasks.{transfer_format}'
+        return response, 200
+    
+    def import_tasks(self) -> Tuple:
+        try:
+            owner_id = self._owner_id()
+            transfer_format = self._transfer_format(default='ndjson')
+            chunk_size = request.args.get('chunk_size', 1000, type=int)
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be a positive integer")
+            chunk_size = min(chunk_size, MAX_TRANSFER_BATCH)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # utf-8-sig also accepts the byte order mark Excel writes at the start of a CSV
+        stream = io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline='')
+        reader = task_transfer.read_csv if transfer_format == 'csv' else task_transfer.read_ndjson
+        
+        def events():
+            try:
+                for event in self.service.import_tasks(reader(stream), owner_id, chunk_size):
+                    yield json.dumps(event) + '\n'
+            except Exception as e:
+                yield json.dumps({'type': 'failed', 'error': str(e)}) + '\n'
+        
+        return Response(stream_with_context(events()), mimetype='application/x-ndjson'), 200
@@ -1,6 +1,7 @@
 -- Task table with improved schema design
 CREATE TABLE IF NOT EXISTS task (
     id INT AUTO_INCREMENT PRIMARY KEY,
+    owner_id VARCHAR(64) DEFAULT 'default' NOT NULL,
     title VARCHAR(255) NOT NULL,
     description TEXT,
     completed BOOLEAN DEFAULT FALSE NOT NULL,
@@ -8,11 +9,17 @@ CREATE TABLE IF NOT EXISTS task (
     due_date DATETIME NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP NOT NULL,
+    completed_at DATETIME NULL,
     
     -- Constraints
     CONSTRAINT chk_title_not_empty CHECK (CHAR_LENGTH(TRIM(title)) > 0),
     
     -- Indexes for performance
+    INDEX idx_owner_id (owner_id, id),
+    INDEX idx_owner_created (owner_id, created_at DESC),
+    INDEX idx_owner_completed (owner_id, completed),
+    INDEX idx_owner_updated (owner_id, updated_at),
+    INDEX idx_owner_open_due (owner_id, completed, due_date),
     INDEX idx_completed (completed),
     INDEX idx_created_at (created_at DESC),
     INDEX idx_completed_created (completed, created_at DESC),
@@ -20,4 +27,40 @@ CREATE TABLE IF NOT EXISTS task (
     INDEX idx_priority (priority)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Migrations for databases created before these columns and indexes existed. CREATE TABLE IF
+-- NOT EXISTS leaves an existing table untouched, so each change is applied only when missing;
+-- the script is safe to run any number of times.
+SET @ddl = (SELECT IF(COUNT(*) = 0, 'ALTER TABLE task ADD COLUMN owner_id VARCHAR(64) DEFAULT ''default'' NOT NULL AFTER id', 'DO 0')
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'task' AND COLUMN_NAME = 'owner_id');
+PREPARE migration FROM @ddl; EXECUTE migration; DEALLOCATE PREPARE migration;
 
+SET @ddl = (SELECT IF(COUNT(*) = 0, 'ALTER TABLE task ADD COLUMN completed_at DATETIME NULL AFTER updated_at', 'DO 0')
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'task' AND COLUMN_NAME = 'completed_at');
+PREPARE migration FROM @ddl; EXECUTE migration; DEALLOCATE PREPARE migration;
+
+SET @ddl = (SELECT IF(COUNT(*) = 0, 'ALTER TABLE task ADD INDEX idx_owner_id (owner_id, id)', 'DO 0')
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'task' AND INDEX_NAME = 'idx_owner_id');
+PREPARE migration FROM @ddl; EXECUTE migration; DEALLOCATE PREPARE migration;
+
+SET @ddl = (SELECT IF(COUNT(*) = 0, 'ALTER TABLE task ADD INDEX idx_owner_created (owner_id, created_at DESC)', 'DO 0')
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'task' AND INDEX_NAME = 'idx_owner_created');
+PREPARE migration FROM @ddl; EXECUTE migration; DEALLOCATE PREPARE migration;
+
+SET @ddl = (SELECT IF(COUNT(*) = 0, 'ALTER TABLE task ADD INDEX idx_owner_completed (owner_id, completed)', 'DO 0')
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'task' AND INDEX_NAME = 'idx_owner_completed');
+PREPARE migration FROM @ddl; EXECUTE migration; DEALLOCATE PREPARE migration;
+
+SET @ddl = (SELECT IF(COUNT(*) = 0, 'ALTER TABLE task ADD INDEX idx_owner_updated (owner_id, updated_at)', 'DO 0')
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'task' AND INDEX_NAME = 'idx_owner_updated');
+PREPARE migration FROM @ddl; EXECUTE migration; DEALLOCATE PREPARE migration;
+
+SET @ddl = (SELECT IF(COUNT(*) = 0, 'ALTER TABLE task ADD INDEX idx_owner_open_due (owner_id, completed, due_date)', 'DO 0')
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'task' AND INDEX_NAME = 'idx_owner_open_due');
+PREPARE migration FROM @ddl; EXECUTE migration; DEALLOCATE PREPARE migration;
@@ -1,4 +1,6 @@
 """Repository layer package."""
-from .task_repository import TaskRepository
+from .task_repository import TaskRepository, DEFAULT_OWNER
+from .task_record import TaskRecord, records_to_json
+from .shard_router import ShardRouter, ConsistentHashRing
 
-__all__ = ['TaskRepository']
+__all__ = ['TaskRepository', 'DEFAULT_OWNER', 'TaskRecord', 'records_to_json', 'ShardRouter', 'ConsistentHashRing']
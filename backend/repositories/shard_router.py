@@ -0,0 +1,130 @@
+import bisect
+import hashlib
+import itertools
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Sequence, Tuple
+
+from repositories.task_repository import TaskRepository, TaskRow, DEFAULT_OWNER
+from repositories.task_record import TaskRecord
+
+
+class ConsistentHashRing:
+    
+    def __init__(self, nodes: Iterable[str] = (), virtual_nodes: int = 100):
+        self.virtual_nodes = virtual_nodes
+        self._hashes: List[int] = []
+        self._nodes: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+    
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+    
+    def add_node(self, node: str):
+        for replica in range(self.virtual_nodes):
+            point = self._hash(f"{node}#{replica}")
+            index = bisect.bisect(self._hashes, point)
+            self._hashes.insert(index, point)
+            self._nodes.insert(index, node)
+    
+    def remove_node(self, node: str):
+        kept = [(point, name) for point, name in zip(self._hashes, self._nodes) if name != node]
+        self._hashes = [point for point, _ in kept]
+        self._nodes = [name for _, name in kept]
+    
+    def get_node(self, key: str) -> str:
+        if not self._hashes:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+class ShardRouter:
+    
+    def __init__(self, shards: Dict[str, TaskRepository], virtual_nodes: int = 100):
+        if not shards:
+            raise ValueError("At least one shard is required")
+        self.shards = dict(shards)
+        self.ring = ConsistentHashRing(self.shards.keys(), virtual_nodes)
+    
+    @staticmethod
+    def reassignments(owner_ids: Iterable[str], current_shards: Iterable[str], new_shards: Iterable[str],
+                      virtual_nodes: int = 100) -> Dict[str, Tuple[str, str]]:
+        # The shard list is fixed for the life of the process and rows are never moved
+        # automatically. Before changing DB_SHARDS, this lists which owners would be routed
+        # elsewhere as {owner_id: (current_shard, new_shard)}; their tasks must be moved first.
+        current_ring = ConsistentHashRing(current_shards, virtual_nodes)
+        new_ring = ConsistentHashRing(new_shards, virtual_nodes)
+        moves = {}
+        for owner_id in owner_ids:
+            current, new = current_ring.get_node(owner_id), new_ring.get_node(owner_id)
+            if current != new:
+                moves[owner_id] = (current, new)
+        return moves
+    
+    def shard_name_for(self, owner_id: str) -> str:
+        return self.ring.get_node(owner_id)
+    
+    def shard_for(self, owner_id: str) -> TaskRepository:
+        return self.shards[self.shard_name_for(owner_id)]
+    
+    def find_all(self, owner_id: str = DEFAULT_OWNER) -> List[TaskRecord]:
+        return self.shard_for(owner_id).find_all(owner_id)
+    
+    def iter_all(self, owner_id: str = DEFAULT_OWNER, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        return self.shard_for(owner_id).iter_all(owner_id, batch_size)
+    
+    def find_updated_since(self, owner_id: str = DEFAULT_OWNER,
+                           since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        return self.shard_for(owner_id).find_updated_since(owner_id, since)
+    
+    def find_snapshot_rows(self, owner_id: str, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        return self.shard_for(owner_id).find_snapshot_rows(owner_id, ids)
+    
+    def find_ids(self, owner_id: str = DEFAULT_OWNER) -> List[int]:
+        return self.shard_for(owner_id).find_ids(owner_id)
+    
+    def find_due_between(self, owner_id: str, start: datetime, end: datetime) -> List[TaskRecord]:
+        return self.shard_for(owner_id).find_due_between(owner_id, start, end)
+    
+    def find_overdue(self, owner_id: str, now: datetime) -> List[TaskRecord]:
+        return self.shard_for(owner_id).find_overdue(owner_id, now)
+    
+    def iter_scheduled(self, owner_id: Optional[str] = None,
+                       batch_size: int = 10000) -> Iterator[Tuple[str, int, datetime]]:
+        if owner_id is not None:
+            return self.shard_for(owner_id).iter_scheduled(owner_id, batch_size)
+        return itertools.chain.from_iterable(
+            shard.iter_scheduled(None, batch_size) for shard in self.shards.values()
+        )
+    
+    def find_by_id(self, task_id: int, owner_id: str = DEFAULT_OWNER) -> Optional[Dict[str, Any]]:
+        return self.shard_for(owner_id).find_by_id(task_id, owner_id)
+    
+    def create(self, title: str, description: str, completed: bool = False,
+               priority: str = 'normal', due_date: Optional[str] = None,
+               owner_id: str = DEFAULT_OWNER) -> int:
+        return self.shard_for(owner_id).create(
+            title, description, completed, priority, due_date, owner_id=owner_id
+        )
+    
+    def bulk_create(self, rows: Sequence[TaskRow], owner_id: str = DEFAULT_OWNER) -> List[int]:
+        return self.shard_for(owner_id).bulk_create(rows, owner_id)
+    
+    def update(self, task_id: int, title: Optional[str] = None,
+               description: Optional[str] = None, completed: Optional[bool] = None,
+               priority: Optional[str] = None, due_date: Optional[str] = None,
+               owner_id: str = DEFAULT_OWNER) -> bool:
+        return self.shard_for(owner_id).update(
+            task_id, title, description, completed, priority, due_date, owner_id=owner_id
+        )
+    
+    def delete(self, task_id: int, owner_id: str = DEFAULT_OWNER) -> bool:
+        return self.shard_for(owner_id).delete(task_id, owner_id)
+    
+    def count_all(self, owner_id: str = DEFAULT_OWNER) -> int:
+        return self.shard_for(owner_id).count_all(owner_id)
+    
+    def count_by_status(self, completed: bool, owner_id: str = DEFAULT_OWNER) -> int:
+        return self.shard_for(owner_id).count_by_status(completed, owner_id)
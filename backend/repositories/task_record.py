@@ -0,0 +1,110 @@
+import json
+from collections.abc import Mapping
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from json.encoder import encode_basestring_ascii
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def _encode_datetime(value: datetime) -> str:
+    # Same RFC 1123 format as Flask's jsonify (werkzeug's http_date; naive values are UTC),
+    # so responses do not change, without going through email.utils for every cell
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return (f'"{WEEKDAYS[value.weekday()]}, {value.day:02d} {MONTHS[value.month - 1]} {value.year:04d} '
+            f'{value.hour:02d}:{value.minute:02d}:{value.second:02d} GMT"')
+
+
+def _encode_date(value: date) -> str:
+    return f'"{WEEKDAYS[value.weekday()]}, {value.day:02d} {MONTHS[value.month - 1]} {value.year:04d} 00:00:00 GMT"'
+
+
+_ENCODERS: Dict[type, Callable[[Any], str]] = {
+    type(None): lambda value: 'null',
+    bool: lambda value: 'true' if value else 'false',
+    int: int.__repr__,
+    float: json.dumps,
+    str: encode_basestring_ascii,
+    datetime: _encode_datetime,
+    date: _encode_date,
+    Decimal: lambda value: encode_basestring_ascii(str(value)),
+    bytes: lambda value: encode_basestring_ascii(value.decode()),
+    bytearray: lambda value: encode_basestring_ascii(value.decode()),
+}
+
+
+def _encode_value(value: Any) -> str:
+    # Slow path for subclasses of the types above
+    for kind, encoder in _ENCODERS.items():
+        if isinstance(value, kind):
+            return encoder(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _ordered_getter(positions: Tuple[int, ...]) -> Callable[[Sequence[Any]], Tuple[Any, ...]]:
+    # itemgetter returns a bare value, not a 1-tuple, for a single position
+    if len(positions) > 1:
+        return itemgetter(*positions)
+    return lambda values: tuple(values[position] for position in positions)
+
+
+class RecordLayout:
+    # Column metadata shared by every record of one result set
+    __slots__ = ('columns', 'index', 'json_prefixes', 'json_order')
+    
+    def __init__(self, columns: Sequence[str]):
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.index: Dict[str, int] = {name: position for position, name in enumerate(self.columns)}
+        # Keys are emitted sorted, like jsonify; their '"key":' prefixes are encoded once per result set
+        ordered = sorted(self.index.items())
+        self.json_prefixes: Tuple[str, ...] = tuple(encode_basestring_ascii(name) + ':' for name, _ in ordered)
+        self.json_order = _ordered_getter(tuple(position for _, position in ordered))
+
+
+class TaskRecord(Mapping):
+    # Read-only task row: the cursor's value tuple plus a shared RecordLayout, instead of a dict
+    # per row repeating every column name. Behaves like a mapping for task['title'] / .get().
+    __slots__ = ('_layout', '_values')
+    
+    def __init__(self, layout: RecordLayout, values: Sequence[Any]):
+        self._layout = layout
+        self._values = values
+    
+    @classmethod
+    def from_rows(cls, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> List['TaskRecord']:
+        if not rows:
+            return []
+        layout = RecordLayout(columns)
+        return [cls(layout, row) for row in rows]
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._layout.index[key]]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout.columns)
+    
+    def __len__(self) -> int:
+        return len(self._layout.columns)
+    
+    def __repr__(self) -> str:
+        return f"TaskRecord({dict(self)!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._layout.columns, self._values))
+    
+    def to_json(self) -> str:
+        layout = self._layout
+        encoder_for = _ENCODERS.get
+        return '{' + ','.join([
+            prefix + encoder_for(type(value), _encode_value)(value)
+            for prefix, value in zip(layout.json_prefixes, layout.json_order(self._values))
+        ]) + '}'
+
+
+def records_to_json(records: Sequence[TaskRecord]) -> str:
+    return '[' + ','.join([record.to_json() for record in records]) + ']'
@@ -1,48 +1,214 @@
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterator, Sequence, Tuple, Union
 from mysql.connector import MySQLConnection
-from mysql.connector.cursor import MySQLCursorDict
+from mysql.connector.cursor import MySQLCursor
+from config.database import DatabaseConnection, GuardedCursor
+from config.replication import ReplicaSet, session_token
+from repositories.task_record import TaskRecord
+
+
+DEFAULT_OWNER = 'default'
+SNAPSHOT_COLUMNS = "id, completed, priority, due_date, created_at, updated_at, completed_at"
+
+# (title, description, completed, priority, due_date, created_at, updated_at, completed_at) as
+# written by bulk_create; the timestamps may be None to let the database fill them in
+TaskRow = Tuple[str, str, bool, str, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+# dictionary=True gives a MySQLCursorDict (a MySQLCursor subclass), dictionary=False a plain
+# tuple cursor; DatabaseConnection hands either back wrapped in a GuardedCursor
+Cursor = Union[MySQLCursor, GuardedCursor]
 
 
 class TaskRepository:
     
-    def __init__(self, db_connection: MySQLConnection):
+    def __init__(self, db_connection: Union[MySQLConnection, DatabaseConnection],
+                 replicas: Optional[ReplicaSet] = None):
         self.db = db_connection
+        self.replicas = replicas
     
-    def get_cursor(self) -> MySQLCursorDict:
-        return self.db.cursor(dictionary=True)
+    def get_cursor(self, dictionary: bool = True) -> Cursor:
+        return self.db.cursor(dictionary=dictionary)
     
-    def find_all(self) -> List[Dict[str, Any]]:
-        cursor = self.get_cursor()
+    def get_read_cursor(self, dictionary: bool = True) -> Cursor:
+        if self.replicas is None:
+            return self.get_cursor(dictionary)
+        return self.replicas.reader(session_token.get()).cursor(dictionary=dictionary)
+    
+    def _commit(self):
+        self.db.commit()
+        if self.replicas is not None:
+            self.replicas.record_write()
+    
+    def find_all(self, owner_id: str = DEFAULT_OWNER) -> List[TaskRecord]:
+        # Tuple cursor: rows stay as value tuples sharing one column layout instead of one dict each
+        cursor = self.get_read_cursor(dictionary=False)
+        try:
+            cursor.execute(
+                "SELECT * FROM task WHERE owner_id = %s ORDER BY created_at DESC",
+                (owner_id,)
+            )
+            return TaskRecord.from_rows(cursor.column_names, cursor.fetchall())
+        finally:
+            cursor.close()
+    
+    def iter_all(self, owner_id: str = DEFAULT_OWNER, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        # Keyset pages of short buffered queries: memory stays bounded by batch_size and no
+        # cursor is left open on the shared connection while the caller consumes a page
+        last_id = 0
+        while True:
+            cursor = self.get_read_cursor()
+            try:
+                cursor.execute(
+                    "SELECT * FROM task WHERE owner_id = %s AND id > %s ORDER BY id LIMIT %s",
+                    (owner_id, last_id, batch_size)
+                )
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+            
+            yield from rows
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1]['id']
+    
+    def find_updated_since(self, owner_id: str = DEFAULT_OWNER,
+                           since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        cursor = self.get_read_cursor()
         try:
-            cursor.execute("SELECT * FROM task ORDER BY created_at DESC")
+            query = f"SELECT {SNAPSHOT_COLUMNS} FROM task WHERE owner_id = %s"
+            params = [owner_id]
+            if since is not None:
+                query += " AND updated_at >= %s"
+                params.append(since)
+            cursor.execute(query, tuple(params))
             return cursor.fetchall()
         finally:
             cursor.close()
     
-    def find_by_id(self, task_id: int) -> Optional[Dict[str, Any]]:
-        cursor = self.get_cursor()
+    def find_snapshot_rows(self, owner_id: str, ids: Sequence[int],
+                           batch_size: int = 1000) -> List[Dict[str, Any]]:
+        # Same columns as find_updated_since, for specific ids; large id lists are split so
+        # no single IN (...) list grows unbounded
+        rows: List[Dict[str, Any]] = []
+        cursor = self.get_read_cursor()
+        try:
+            for start in range(0, len(ids), batch_size):
+                batch = list(ids[start:start + batch_size])
+                placeholders = ', '.join(['%s'] * len(batch))
+                cursor.execute(
+                    f"SELECT {SNAPSHOT_COLUMNS} FROM task WHERE owner_id = %s AND id IN ({placeholders})",
+                    (owner_id, *batch)
+                )
+                rows.extend(cursor.fetchall())
+            return rows
+        finally:
+            cursor.close()
+    
+    def find_ids(self, owner_id: str = DEFAULT_OWNER) -> List[int]:
+        cursor = self.get_read_cursor()
+        try:
+            cursor.execute("SELECT id FROM task WHERE owner_id = %s", (owner_id,))
+            return [row['id'] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    
+    def find_due_between(self, owner_id: str, start: datetime, end: datetime) -> List[TaskRecord]:
+        cursor = self.get_read_cursor(dictionary=False)
         try:
-            cursor.execute("SELECT * FROM task WHERE id = %s", (task_id,))
+            cursor.execute(
+                "SELECT * FROM task WHERE owner_id = %s AND completed = FALSE "
+                "AND due_date >= %s AND due_date < %s ORDER BY due_date",
+                (owner_id, start, end)
+            )
+            return TaskRecord.from_rows(cursor.column_names, cursor.fetchall())
+        finally:
+            cursor.close()
+    
+    def find_overdue(self, owner_id: str, now: datetime) -> List[TaskRecord]:
+        cursor = self.get_read_cursor(dictionary=False)
+        try:
+            cursor.execute(
+                "SELECT * FROM task WHERE owner_id = %s AND completed = FALSE "
+                "AND due_date < %s ORDER BY due_date",
+                (owner_id, now)
+            )
+            return TaskRecord.from_rows(cursor.column_names, cursor.fetchall())
+        finally:
+            cursor.close()
+    
+    def iter_scheduled(self, owner_id: Optional[str] = None,
+                       batch_size: int = 10000) -> Iterator[Tuple[str, int, datetime]]:
+        cursor = self.get_read_cursor()
+        try:
+            query = "SELECT owner_id, id, due_date FROM task WHERE completed = FALSE AND due_date IS NOT NULL"
+            params: Tuple = ()
+            if owner_id is not None:
+                query += " AND owner_id = %s"
+                params = (owner_id,)
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row['owner_id'], row['id'], row['due_date']
+        finally:
+            cursor.close()
+    
+    def find_by_id(self, task_id: int, owner_id: str = DEFAULT_OWNER) -> Optional[Dict[str, Any]]:
+        cursor = self.get_read_cursor()
+        try:
+            cursor.execute("SELECT * FROM task WHERE id = %s AND owner_id = %s", (task_id, owner_id))
             return cursor.fetchone()
         finally:
             cursor.close()
     
     def create(self, title: str, description: str, completed: bool = False, 
-               priority: str = 'normal', due_date: Optional[str] = None) -> int:
+               priority: str = 'normal', due_date: Optional[str] = None,
+               owner_id: str = DEFAULT_OWNER) -> int:
         cursor = self.get_cursor()
         try:
             cursor.execute(
-                "INSERT INTO task (title, description, completed, priority, due_date) VALUES (%s, %s, %s, %s, %s)",
-                (title, description, completed, priority, due_date)
+                "INSERT INTO task (owner_id, title, description, completed, priority, due_date) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                (owner_id, title, description, completed, priority, due_date)
             )
-            self.db.commit()
+            self._commit()
             return cursor.lastrowid
         finally:
             cursor.close()
     
+    def bulk_create(self, rows: Sequence[TaskRow], owner_id: str = DEFAULT_OWNER) -> List[int]:
+        # executemany folds the rows into a single multi-row INSERT. Missing timestamps fall
+        # back to now for created_at, to created_at for updated_at and, on completed rows, to
+        # updated_at for completed_at; MySQL lets a VALUES expression read columns set before it.
+        # InnoDB gives a multi-row INSERT with a known row count (a "simple insert") one block of
+        # ids spaced by auto_increment_increment, in every innodb_autoinc_lock_mode, and lastrowid
+        # reports the first of them; the step is read on the same connection.
+        if not rows:
+            return []
+        cursor = self.get_cursor()
+        try:
+            cursor.executemany(
+                "INSERT INTO task (owner_id, title, description, completed, priority, due_date, "
+                "created_at, updated_at, completed_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP), "
+                "COALESCE(%s, created_at), IF(completed, COALESCE(%s, updated_at), NULL))",
+                [(owner_id,) + tuple(row) for row in rows]
+            )
+            first_id, count = cursor.lastrowid, cursor.rowcount
+            cursor.execute("SELECT @@auto_increment_increment AS step")
+            step = int(cursor.fetchone()['step'])
+            self._commit()
+            return list(range(first_id, first_id + count * step, step))
+        finally:
+            cursor.close()
+    
     def update(self, task_id: int, title: Optional[str] = None, 
                description: Optional[str] = None, completed: Optional[bool] = None,
-               priority: Optional[str] = None, due_date: Optional[str] = None) -> bool:
+               priority: Optional[str] = None, due_date: Optional[str] = None,
+               owner_id: str = DEFAULT_OWNER) -> bool:
         cursor = self.get_cursor()
         try:
             update_fields = []
@@ -58,6 +224,7 @@ class TaskRepository:
             
             if completed is not None:
                 update_fields.append("completed = %s")
+                update_fields.append("completed_at = IF(completed, COALESCE(completed_at, NOW()), NULL)")
                 params.append(completed)
             
             if priority is not None:
@@ -71,38 +238,41 @@ class TaskRepository:
             if not update_fields:
                 return False
             
-            params.append(task_id)
-            query = f"UPDATE task SET {', '.join(update_fields)} WHERE id = %s"
+            params.extend([task_id, owner_id])
+            query = f"UPDATE task SET {', '.join(update_fields)} WHERE id = %s AND owner_id = %s"
             
             cursor.execute(query, tuple(params))
-            self.db.commit()
+            self._commit()
             
             return cursor.rowcount > 0
         finally:
             cursor.close()
     
-    def delete(self, task_id: int) -> bool:
+    def delete(self, task_id: int, owner_id: str = DEFAULT_OWNER) -> bool:
         cursor = self.get_cursor()
         try:
-            cursor.execute("DELETE FROM task WHERE id = %s", (task_id,))
-            self.db.commit()
+            cursor.execute("DELETE FROM task WHERE id = %s AND owner_id = %s", (task_id, owner_id))
+            self._commit()
             return cursor.rowcount > 0
         finally:
             cursor.close()
     
-    def count_all(self) -> int:
-        cursor = self.get_cursor()
+    def count_all(self, owner_id: str = DEFAULT_OWNER) -> int:
+        cursor = self.get_read_cursor()
         try:
-            cursor.execute("SELECT COUNT(*) as count FROM task")
+            cursor.execute("SELECT COUNT(*) as count FROM task WHERE owner_id = %s", (owner_id,))
             result = cursor.fetchone()
             return result['count'] if result else 0
         finally:
             cursor.close()
     
-    def count_by_status(self, completed: bool) -> int:
-        cursor = self.get_cursor()
+    def count_by_status(self, completed: bool, owner_id: str = DEFAULT_OWNER) -> int:
+        cursor = self.get_read_cursor()
         try:
-            cursor.execute("SELECT COUNT(*) as count FROM task WHERE completed = %s", (completed,))
+            cursor.execute(
+                "SELECT COUNT(*) as count FROM task WHERE owner_id = %s AND completed = %s",
+                (owner_id, completed)
+            )
             result = cursor.fetchone()
             return result['count'] if result else 0
         finally:
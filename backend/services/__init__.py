@@ -1,4 +1,8 @@
 """Service layer package."""
 from .task_service import TaskService
+from .analytics_service import TaskAnalyticsService
+from .due_date_scheduler import DueDateScheduler
+from .profile_store import ProfileStore
+from .request_profiler import RequestProfiler
 
-__all__ = ['TaskService']
+__all__ = ['TaskService', 'TaskAnalyticsService', 'DueDateScheduler', 'ProfileStore', 'RequestProfiler']
@@ -0,0 +1,160 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from repositories.task_repository import TaskRepository, DEFAULT_OWNER
+
+
+SNAPSHOT_COLUMNS = ['id', 'completed', 'priority', 'due_date', 'created_at', 'updated_at', 'completed_at']
+PRIORITIES = ['low', 'normal', 'urgent']
+BUCKETS = {'day': 'D', 'week': 'W', 'month': 'M'}
+# Rows committed late with an older updated_at than rows already read are caught by re-reading
+# this far behind the watermark
+REFRESH_OVERLAP = timedelta(seconds=5)
+# Upper edges (hours) of the time-to-complete histogram bins
+TIME_TO_COMPLETE_BINS = [0, 1, 4, 24, 72, 168, 720, np.inf]
+
+
+class TaskSnapshot:
+    
+    def __init__(self):
+        self.frame = self._to_frame([])
+        self.watermark: Optional[pd.Timestamp] = None
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def _to_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        frame = pd.DataFrame.from_records(rows, columns=SNAPSHOT_COLUMNS)
+        frame['completed'] = frame['completed'].astype(bool)
+        frame['priority'] = pd.Categorical(frame['priority'], categories=PRIORITIES)
+        for column in ('due_date', 'created_at', 'updated_at', 'completed_at'):
+            frame[column] = pd.to_datetime(frame[column])
+        return frame.set_index('id')
+    
+    def _merge(self, changed: pd.DataFrame):
+        # Re-read rows replace their previous version rather than being appended twice
+        kept = self.frame[~self.frame.index.isin(changed.index)]
+        self.frame = changed if kept.empty else pd.concat([kept, changed])
+    
+    def refresh(self, repository: TaskRepository, owner_id: str):
+        since = (self.watermark - REFRESH_OVERLAP).to_pydatetime() if self.watermark is not None else None
+        changed = self._to_frame(repository.find_updated_since(owner_id, since))
+        
+        if not changed.empty:
+            self._merge(changed)
+            latest = changed['updated_at'].max()
+            if self.watermark is None or latest > self.watermark:
+                self.watermark = latest
+        
+        # Deletions leave no updated_at trace, and a row committed with an updated_at older than
+        # the overlap window is never re-read; a size mismatch reconciles against the live ids
+        if len(self.frame) != repository.count_all(owner_id):
+            ids = repository.find_ids(owner_id)
+            self.frame = self.frame[self.frame.index.isin(ids)]
+            missing = list(set(ids).difference(self.frame.index))
+            if missing:
+                self._merge(self._to_frame(repository.find_snapshot_rows(owner_id, missing)))
+
+
+class TaskAnalyticsService:
+    
+    def __init__(self, task_repository: TaskRepository, max_snapshots: int = 128):
+        self.repository = task_repository
+        self.max_snapshots = max_snapshots
+        self._snapshots: 'OrderedDict[str, TaskSnapshot]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _snapshot_for(self, owner_id: str) -> TaskSnapshot:
+        with self._lock:
+            snapshot = self._snapshots.get(owner_id)
+            if snapshot is None:
+                snapshot = TaskSnapshot()
+                self._snapshots[owner_id] = snapshot
+                while len(self._snapshots) > self.max_snapshots:
+                    self._snapshots.popitem(last=False)
+            else:
+                self._snapshots.move_to_end(owner_id)
+            return snapshot
+    
+    def get_analytics(self, owner_id: str = DEFAULT_OWNER, bucket: str = 'day',
+                      now: Optional[datetime] = None) -> Dict[str, Any]:
+        if bucket not in BUCKETS:
+            raise ValueError("Bucket must be 'day', 'week', or 'month'")
+        
+        snapshot = self._snapshot_for(owner_id)
+        with snapshot.lock:
+            snapshot.refresh(self.repository, owner_id)
+            frame = snapshot.frame
+        
+        now = pd.Timestamp(now or datetime.now())
+        frequency = BUCKETS[bucket]
+        
+        # Tasks imported as completed have no completed_at; their last update is the best estimate
+        completed_at = frame['completed_at'].where(frame['completed_at'].notna(), frame['updated_at'])
+        completed_at = completed_at.where(frame['completed'])
+        
+        return {
+            'total': int(len(frame)),
+            'bucket': bucket,
+            'completion_rate': self._completion_rate(frame, frequency),
+            'time_to_complete': self._time_to_complete(frame, completed_at),
+            'overdue_by_priority': self._overdue_by_priority(frame, now),
+            'created_vs_completed': self._created_vs_completed(frame, completed_at, frequency),
+        }
+    
+    @staticmethod
+    def _period_label(periods: pd.Index) -> List[str]:
+        return [period.start_time.date().isoformat() for period in periods]
+    
+    def _completion_rate(self, frame: pd.DataFrame, frequency: str) -> List[Dict[str, Any]]:
+        if frame.empty:
+            return []
+        cohorts = frame['completed'].groupby(frame['created_at'].dt.to_period(frequency)).agg(['size', 'mean'])
+        return [
+            {'period': label, 'created': int(size), 'completion_rate': round(float(rate), 4)}
+            for label, size, rate in zip(self._period_label(cohorts.index), cohorts['size'], cohorts['mean'])
+        ]
+    
+    def _time_to_complete(self, frame: pd.DataFrame, completed_at: pd.Series) -> Dict[str, Any]:
+        hours = ((completed_at - frame['created_at']).dt.total_seconds() / 3600.0).dropna().to_numpy()
+        hours = np.clip(hours, 0, None)
+        
+        counts, _ = np.histogram(hours, bins=TIME_TO_COMPLETE_BINS)
+        histogram = [
+            {'max_hours': None if np.isinf(upper) else upper, 'count': int(count)}
+            for upper, count in zip(TIME_TO_COMPLETE_BINS[1:], counts)
+        ]
+        
+        if hours.size == 0:
+            return {'count': 0, 'mean_hours': None, 'median_hours': None,
+                    'p90_hours': None, 'histogram': histogram}
+        
+        median, p90 = np.percentile(hours, [50, 90])
+        return {
+            'count': int(hours.size),
+            'mean_hours': round(float(hours.mean()), 2),
+            'median_hours': round(float(median), 2),
+            'p90_hours': round(float(p90), 2),
+            'histogram': histogram,
+        }
+    
+    def _overdue_by_priority(self, frame: pd.DataFrame, now: pd.Timestamp) -> Dict[str, int]:
+        overdue = ~frame['completed'] & (frame['due_date'] < now)
+        counts = frame.loc[overdue, 'priority'].value_counts().reindex(PRIORITIES, fill_value=0)
+        return {priority: int(count) for priority, count in counts.items()}
+    
+    def _created_vs_completed(self, frame: pd.DataFrame, completed_at: pd.Series,
+                              frequency: str) -> List[Dict[str, Any]]:
+        created = frame['created_at'].dt.to_period(frequency).value_counts()
+        completed = completed_at.dropna().dt.to_period(frequency).value_counts()
+        trend = pd.concat([created.rename('created'), completed.rename('completed')], axis=1)
+        trend = trend.fillna(0).astype(int).sort_index()
+        return [
+            {'period': label, 'created': int(created_count), 'completed': int(completed_count)}
+            for label, created_count, completed_count
+            in zip(self._period_label(trend.index), trend['created'], trend['completed'])
+        ]
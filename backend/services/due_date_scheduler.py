@@ -0,0 +1,180 @@
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+DUE = 'due'
+OVERDUE = 'overdue'
+
+TaskKey = Tuple[str, int]
+DueDate = Union[datetime, str, None]
+
+
+def _timestamp(due_date: DueDate) -> Optional[float]:
+    if due_date is None or due_date == '':
+        return None
+    if isinstance(due_date, str):
+        due_date = datetime.fromisoformat(due_date)
+    return due_date.timestamp()
+
+
+class DueDateScheduler:
+    # Min-heap of (fire_at, version, kind, owner_id, task_id). Rescheduling or removing a
+    # task only bumps its version in _tasks; heap entries with an outdated version are
+    # dropped lazily when they reach the top, so every mutation is a single O(log n) push.
+    # Each task holds at most one live entry: the 'due' reminder, then its 'overdue' event.
+    
+    def __init__(self, reminder_lead: timedelta = timedelta(hours=24),
+                 clock: Callable[[], float] = time.time):
+        self.reminder_lead = reminder_lead.total_seconds()
+        self.clock = clock
+        self._heap: List[Tuple[float, int, str, str, int]] = []
+        self._tasks: Dict[TaskKey, Tuple[float, int]] = {}
+        self._version = 0
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
+    
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        self._listeners.append(listener)
+    
+    def _next_entry(self, owner_id: str, task_id: int, due_at: float, version: int,
+                    now: float) -> Optional[Tuple[float, int, str, str, int]]:
+        # Only transitions still ahead of us are scheduled: a task already inside its
+        # reminder window waits for its overdue event, an already overdue task fires nothing.
+        # A zero reminder_lead disables the 'due' reminder altogether.
+        remind_at = due_at - self.reminder_lead
+        if self.reminder_lead > 0 and now < remind_at:
+            return (remind_at, version, DUE, owner_id, task_id)
+        if now < due_at:
+            return (due_at, version, OVERDUE, owner_id, task_id)
+        return None
+    
+    def load(self, tasks: Iterable[Tuple[str, int, DueDate]]):
+        # Rows are read (possibly from the database) before taking the lock, so the timer
+        # thread and schedule() are only held up for the in-memory merge
+        tasks = list(tasks)
+        now = self.clock()
+        with self._condition:
+            entries = []
+            for owner_id, task_id, due_date in tasks:
+                due_at = _timestamp(due_date)
+                self._version += 1
+                entry = None if due_at is None else self._next_entry(owner_id, task_id, due_at, self._version, now)
+                if entry is None:
+                    self._tasks.pop((owner_id, task_id), None)
+                    continue
+                self._tasks[(owner_id, task_id)] = (due_at, self._version)
+                entries.append(entry)
+            if len(entries) > len(self._heap) // 8:
+                self._heap.extend(entries)
+                heapq.heapify(self._heap)
+            else:
+                for entry in entries:
+                    heapq.heappush(self._heap, entry)
+            # Reloading tasks that are already scheduled leaves their old entries behind
+            self._compact_if_needed()
+            self._condition.notify()
+    
+    def schedule(self, owner_id: str, task_id: int, due_date: DueDate, completed: bool = False):
+        due_at = None if completed else _timestamp(due_date)
+        if due_at is None:
+            self.unschedule(owner_id, task_id)
+            return
+        
+        with self._condition:
+            self._version += 1
+            entry = self._next_entry(owner_id, task_id, due_at, self._version, self.clock())
+            if entry is None:
+                self._tasks.pop((owner_id, task_id), None)
+                return
+            self._tasks[(owner_id, task_id)] = (due_at, self._version)
+            heapq.heappush(self._heap, entry)
+            self._compact_if_needed()
+            if self._heap[0] is entry:
+                self._condition.notify()
+    
+    def unschedule(self, owner_id: str, task_id: int):
+        with self._condition:
+            if self._tasks.pop((owner_id, task_id), None) is not None:
+                self._compact_if_needed()
+    
+    def _compact_if_needed(self):
+        # Stale entries are normally discarded as they surface; rebuild once they dominate
+        if len(self._heap) > 1024 and len(self._heap) > 2 * len(self._tasks):
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+    
+    def _is_live(self, entry: Tuple[float, int, str, str, int]) -> bool:
+        current = self._tasks.get((entry[3], entry[4]))
+        return current is not None and current[1] == entry[1]
+    
+    def next_fire_time(self) -> Optional[float]:
+        with self._condition:
+            while self._heap and not self._is_live(self._heap[0]):
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+    
+    def pop_due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = self.clock() if now is None else now
+        events = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if not self._is_live(entry):
+                    continue
+                _, version, kind, owner_id, task_id = entry
+                due_at = self._tasks[(owner_id, task_id)][0]
+                if kind == DUE:
+                    heapq.heappush(self._heap, (due_at, version, OVERDUE, owner_id, task_id))
+                else:
+                    del self._tasks[(owner_id, task_id)]
+                events.append({
+                    'type': kind,
+                    'owner_id': owner_id,
+                    'task_id': task_id,
+                    'due_date': datetime.fromtimestamp(due_at).isoformat(),
+                })
+        return events
+    
+    def _dispatch(self, events: List[Dict[str, Any]]):
+        for event in events:
+            for listener in self._listeners:
+                try:
+                    listener(event)
+                except Exception as e:
+                    print(f"Due date listener failed for task {event['task_id']}: {e}")
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                next_fire = self.next_fire_time()
+                timeout = None if next_fire is None else max(0.0, next_fire - self.clock())
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+            self._dispatch(self.pop_due())
+    
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name='due-date-scheduler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
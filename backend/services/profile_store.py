@@ -0,0 +1,76 @@
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+
+PROFILE_ID = re.compile(r'^\d{13}-[0-9a-f]{8}$')
+
+
+class ProfileStore:
+    # Keeps the newest max_profiles request profiles on disk as <id>.pstats (cProfile dump)
+    # plus <id>.json (request details and time breakdown); ids sort by creation time
+    
+    def __init__(self, directory: str, max_profiles: int = 100):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+    
+    @staticmethod
+    def new_id() -> str:
+        return f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+    
+    def _path(self, profile_id: str, extension: str) -> str:
+        if not PROFILE_ID.match(profile_id):
+            raise ValueError(f"Invalid profile id '{profile_id}'")
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+    
+    def _ids(self) -> List[str]:
+        return sorted(
+            name[:-len('.json')] for name in os.listdir(self.directory)
+            if name.endswith('.json') and PROFILE_ID.match(name[:-len('.json')])
+        )
+    
+    def save(self, profile_id: str, profiler: cProfile.Profile, summary: Dict[str, Any]):
+        profiler.dump_stats(self._path(profile_id, 'pstats'))
+        # The summary is written last: a profile is only listed once both files exist
+        temporary = self._path(profile_id, 'json') + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(summary, file)
+        os.replace(temporary, self._path(profile_id, 'json'))
+        
+        with self._lock:
+            ids = self._ids()
+            for stale_id in ids[:max(0, len(ids) - self.max_profiles)]:
+                self.delete(stale_id)
+    
+    def delete(self, profile_id: str):
+        for extension in ('json', 'pstats'):
+            try:
+                os.remove(self._path(profile_id, extension))
+            except FileNotFoundError:
+                pass
+    
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        summaries = []
+        for profile_id in reversed(self._ids()):
+            summary = self.get(profile_id)
+            if summary is not None:
+                summaries.append(summary)
+        return summaries
+    
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(profile_id, 'json')) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+    
+    def stats_path(self, profile_id: str) -> Optional[str]:
+        path = self._path(profile_id, 'pstats')
+        return path if os.path.exists(path) else None
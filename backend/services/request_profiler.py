@@ -0,0 +1,165 @@
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config.profiling import ProfilingConfig
+from services.profile_store import ProfileStore
+
+
+# pstats function key: (file, line, function name); builtins have file '~' and line 0
+Function = Tuple[str, int, str]
+
+# Own time of matching functions is attributed to these buckets; everything else is Python time
+DB_MARKERS = ('mysql', 'socket', 'ssl')
+SERIALIZATION_MARKERS = ('json', '_csv', 'task_record.py', 'task_transfer.py')
+
+# Stack subtrees shorter than this (one microsecond) are dropped from collapsed output
+MIN_STACK_SECONDS = 1e-6
+MAX_STACK_DEPTH = 128
+
+
+def categorize(function: Function) -> str:
+    text = f"{function[0]}:{function[2]}".lower()
+    if any(marker in text for marker in DB_MARKERS):
+        return 'db'
+    if any(marker in text for marker in SERIALIZATION_MARKERS):
+        return 'serialization'
+    return 'python'
+
+
+def label(function: Function) -> str:
+    file, line, name = function
+    text = name if file == '~' else f"{name} ({os.path.basename(file)}:{line})"
+    return text.replace(';', ',')
+
+
+def breakdown(stats: Dict[Function, Tuple]) -> Dict[str, float]:
+    # Own time (tottime) partitions the profile, so the buckets add up to the profiled total
+    seconds = {'python': 0.0, 'db': 0.0, 'serialization': 0.0}
+    for function, (_, _, own_time, _, _) in stats.items():
+        seconds[categorize(function)] += own_time
+    return {f"{category}_ms": round(value * 1000, 3) for category, value in seconds.items()}
+
+
+def top_functions(stats: Dict[Function, Tuple], limit: int = 10) -> List[Dict[str, Any]]:
+    ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [
+        {
+            'function': label(function),
+            'category': categorize(function),
+            'calls': calls,
+            'own_ms': round(own_time * 1000, 3),
+            'cumulative_ms': round(cumulative_time * 1000, 3),
+        }
+        for function, (_, calls, own_time, cumulative_time, _) in ranked
+    ]
+
+
+def collapsed_stacks(stats: Dict[Function, Tuple]) -> str:
+    # cProfile keeps caller -> callee edges, not full stacks, so stacks are rebuilt by walking
+    # down from the roots and splitting each function's time across its callees in proportion
+    # to the time spent on each edge. Output is "frame;frame;frame microseconds" per line, as
+    # consumed by flamegraph.pl and speedscope.
+    children: Dict[Function, List[Tuple[Function, float]]] = defaultdict(list)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            children[caller].append((function, edge[3]))
+    
+    totals: Dict[Tuple[str, ...], float] = defaultdict(float)
+    
+    def walk(function: Function, path: Tuple[str, ...], seconds: float, seen: frozenset):
+        _, _, own_time, cumulative_time, _ = stats[function]
+        if cumulative_time <= 0 or seconds < MIN_STACK_SECONDS:
+            return
+        path = path + (label(function),)
+        totals[path] += seconds * min(1.0, own_time / cumulative_time)
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for child, edge_time in children.get(function, ()):
+            if child not in seen:
+                walk(child, path, seconds * min(1.0, edge_time / cumulative_time), seen | {child})
+    
+    for function, (_, _, _, cumulative_time, callers) in stats.items():
+        if not callers:
+            walk(function, (), cumulative_time, frozenset((function,)))
+    
+    return ''.join(
+        f"{';'.join(path)} {round(seconds * 1e6)}\n"
+        for path, seconds in sorted(totals.items()) if round(seconds * 1e6) > 0
+    )
+
+
+class ProfileRun:
+    __slots__ = ('profiler', 'trigger', 'started', 'started_at')
+    
+    def __init__(self, trigger: str):
+        self.profiler = cProfile.Profile()
+        self.trigger = trigger
+        self.started = time.perf_counter()
+        self.started_at = datetime.now()
+
+
+class RequestProfiler:
+    # Decides which requests to profile (privileged token or random sample), runs cProfile
+    # around them and stores the result. One request is profiled at a time: a request arriving
+    # while another is being profiled runs unprofiled, which also bounds the overhead.
+    
+    def __init__(self, config: ProfilingConfig, store: Optional[ProfileStore] = None,
+                 sample: Callable[[], float] = random.random):
+        self.config = config
+        self.store = store or ProfileStore(config.directory, config.max_profiles)
+        self.sample = sample
+        self._active = threading.Lock()
+    
+    def is_privileged(self, token: Optional[str]) -> bool:
+        return bool(self.config.token) and bool(token) and hmac.compare_digest(token, self.config.token)
+    
+    def select(self, token: Optional[str]) -> Optional[str]:
+        if token and self.is_privileged(token):
+            return 'header'
+        if self.config.sample_rate and self.sample() < self.config.sample_rate:
+            return 'sample'
+        return None
+    
+    def start(self, trigger: str) -> Optional[ProfileRun]:
+        if not self._active.acquire(blocking=False):
+            return None
+        run = ProfileRun(trigger)
+        run.profiler.enable()
+        return run
+    
+    def abandon(self, run: ProfileRun):
+        run.profiler.disable()
+        self._active.release()
+    
+    def finish(self, run: ProfileRun, method: str, path: str, status: int) -> Dict[str, Any]:
+        run.profiler.disable()
+        wall_seconds = time.perf_counter() - run.started
+        self._active.release()
+        
+        stats = pstats.Stats(run.profiler).stats
+        summary = {
+            'id': self.store.new_id(),
+            'method': method,
+            'path': path,
+            'status': status,
+            'trigger': run.trigger,
+            'started_at': run.started_at.isoformat(),
+            'wall_ms': round(wall_seconds * 1000, 3),
+            **breakdown(stats),
+            'top': top_functions(stats),
+        }
+        self.store.save(summary['id'], run.profiler, summary)
+        return summary
+    
+    def collapsed(self, profile_id: str) -> Optional[str]:
+        path = self.store.stats_path(profile_id)
+        if path is None:
+            return None
+        return collapsed_stacks(pstats.Stats(path).stats)
@@ -0,0 +1,57 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    # Concurrent callers asking for the same (scope, key) share one execution of the loader.
+    # Nothing is cached: the entry disappears as soon as the leader finishes, and
+    # invalidate(scope) detaches in-flight calls so readers arriving after a write start fresh.
+    
+    def __init__(self):
+        self._calls: Dict[Tuple[str, Hashable], _Call] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, scope: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        call_key = (scope, key)
+        with self._lock:
+            call = self._calls.get(call_key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[call_key] = call
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = loader()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(call_key) is call:
+                    del self._calls[call_key]
+            call.done.set()
+    
+    def invalidate(self, scope: str):
+        with self._lock:
+            for call_key in [call_key for call_key in self._calls if call_key[0] == scope]:
+                del self._calls[call_key]
+    
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
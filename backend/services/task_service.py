@@ -1,21 +1,62 @@
-from typing import List, Optional, Dict, Any
-from repositories.task_repository import TaskRepository
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+from repositories.task_repository import TaskRepository, TaskRow, DEFAULT_OWNER
+from repositories.task_record import TaskRecord
+from config.replication import session_token
+from services.due_date_scheduler import DueDateScheduler
+from services.single_flight import SingleFlight
+
+
+TIMESTAMP_RANGE = (datetime(1970, 1, 2), datetime(2038, 1, 18))
 
 
 class TaskService:
     
-    def __init__(self, task_repository: TaskRepository):
+    def __init__(self, task_repository: TaskRepository, scheduler: Optional[DueDateScheduler] = None,
+                 single_flight: Optional[SingleFlight] = None):
         self.repository = task_repository
+        self.scheduler = scheduler
+        self.single_flight = single_flight or SingleFlight()
+    
+    def _coalesce(self, owner_id: str, key: Tuple, loader):
+        # A client carrying a session token may need the primary, so it never shares a
+        # read with token-less clients that could be served from a lagging replica
+        return self.single_flight.do(owner_id, key + (session_token.get(),), loader)
+    
+    def _invalidate(self, owner_id: str):
+        self.single_flight.invalidate(owner_id)
+    
+    def _reschedule(self, owner_id: str, task: Optional[Dict[str, Any]]):
+        if self.scheduler is not None and task:
+            self.scheduler.schedule(owner_id, task['id'], task.get('due_date'), bool(task.get('completed')))
     
-    def get_all_tasks(self) -> List[Dict[str, Any]]:
-        return self.repository.find_all()
+    def get_all_tasks(self, owner_id: str = DEFAULT_OWNER) -> List[TaskRecord]:
+        return self._coalesce(owner_id, ('find_all',), lambda: self.repository.find_all(owner_id))
     
-    def get_task_by_id(self, task_id: int) -> Optional[Dict[str, Any]]:
-        return self.repository.find_by_id(task_id)
+    def get_task_by_id(self, task_id: int, owner_id: str = DEFAULT_OWNER) -> Optional[Dict[str, Any]]:
+        return self._coalesce(owner_id, ('find_by_id', task_id),
+                              lambda: self.repository.find_by_id(task_id, owner_id))
     
     def create_task(self, title: str, description: str = "", priority: str = 'normal', 
-                    due_date: Optional[str] = None) -> Dict[str, Any]:
+                    due_date: Optional[str] = None, owner_id: str = DEFAULT_OWNER) -> Dict[str, Any]:
         
+        self._validate_new_task(title, description, priority)
+        
+        task_id = self.repository.create(
+            title=title.strip(),
+            description=description.strip(),
+            completed=False,
+            priority=priority,
+            due_date=due_date,
+            owner_id=owner_id
+        )
+        self._invalidate(owner_id)
+        
+        task = self.repository.find_by_id(task_id, owner_id)
+        self._reschedule(owner_id, task)
+        return task
+    
+    def _validate_new_task(self, title: str, description: str, priority: str):
         if not title or not title.strip():
             raise ValueError("Task title is required")
         
@@ -27,24 +68,15 @@ class TaskService:
         
         if priority not in ['low', 'normal', 'urgent']:
             raise ValueError("Priority must be 'low', 'normal', or 'urgent'")
-        
-        task_id = self.repository.create(
-            title=title.strip(),
-            description=description.strip(),
-            completed=False,
-            priority=priority,
-            due_date=due_date
-        )
-        
-        return self.repository.find_by_id(task_id)
     
     def update_task(self, task_id: int, title: Optional[str] = None,
                    description: Optional[str] = None, 
                    completed: Optional[bool] = None,
                    priority: Optional[str] = None,
-                   due_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+                   due_date: Optional[str] = None,
+                   owner_id: str = DEFAULT_OWNER) -> Optional[Dict[str, Any]]:
         
-        existing_task = self.repository.find_by_id(task_id)
+        existing_task = self.repository.find_by_id(task_id, owner_id)
         if not existing_task:
             return None
         
@@ -66,33 +98,138 @@ class TaskService:
             description=description.strip() if description else None,
             completed=completed,
             priority=priority,
-            due_date=due_date if due_date != '' else None
+            due_date=due_date if due_date != '' else None,
+            owner_id=owner_id
         )
+        self._invalidate(owner_id)
         
         if success:
-            return self.repository.find_by_id(task_id)
+            task = self.repository.find_by_id(task_id, owner_id)
+            self._reschedule(owner_id, task)
+            return task
         return None
     
-    def toggle_task_completion(self, task_id: int) -> Optional[Dict[str, Any]]:
-        task = self.repository.find_by_id(task_id)
+    def toggle_task_completion(self, task_id: int, owner_id: str = DEFAULT_OWNER) -> Optional[Dict[str, Any]]:
+        task = self.repository.find_by_id(task_id, owner_id)
         if not task:
             return None
         
         new_status = not task['completed']
-        self.repository.update(task_id, completed=new_status)
+        self.repository.update(task_id, completed=new_status, owner_id=owner_id)
+        self._invalidate(owner_id)
         
-        return self.repository.find_by_id(task_id)
+        task = self.repository.find_by_id(task_id, owner_id)
+        self._reschedule(owner_id, task)
+        return task
+    
+    def delete_task(self, task_id: int, owner_id: str = DEFAULT_OWNER) -> bool:
+        deleted = self.repository.delete(task_id, owner_id)
+        self._invalidate(owner_id)
+        if deleted and self.scheduler is not None:
+            self.scheduler.unschedule(owner_id, task_id)
+        return deleted
+    
+    def get_due_tasks(self, within: timedelta, owner_id: str = DEFAULT_OWNER,
+                      now: Optional[datetime] = None) -> List[TaskRecord]:
+        if within <= timedelta(0):
+            raise ValueError("Due window must be positive")
+        now = now or datetime.now()
+        return self.repository.find_due_between(owner_id, now, now + within)
     
-    def delete_task(self, task_id: int) -> bool:
-        return self.repository.delete(task_id)
+    def get_overdue_tasks(self, owner_id: str = DEFAULT_OWNER,
+                          now: Optional[datetime] = None) -> List[TaskRecord]:
+        return self.repository.find_overdue(owner_id, now or datetime.now())
     
-    def get_task_statistics(self) -> Dict[str, int]:
-        total = self.repository.count_all()
-        completed = self.repository.count_by_status(True)
-        active = self.repository.count_by_status(False)
+    def get_task_statistics(self, owner_id: str = DEFAULT_OWNER) -> Dict[str, int]:
+        return self._coalesce(owner_id, ('statistics',), lambda: self._load_statistics(owner_id))
+    
+    def _load_statistics(self, owner_id: str) -> Dict[str, int]:
+        total = self.repository.count_all(owner_id)
+        completed = self.repository.count_by_status(True, owner_id)
+        active = self.repository.count_by_status(False, owner_id)
         
         return {
             'total': total,
             'active': active,
             'completed': completed
         }
+    
+    def export_tasks(self, owner_id: str = DEFAULT_OWNER, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        return self.repository.iter_all(owner_id, batch_size)
+    
+    def _store_chunk(self, chunk: List[TaskRow], owner_id: str) -> int:
+        task_ids = self.repository.bulk_create(chunk, owner_id)
+        self._invalidate(owner_id)
+        if self.scheduler is not None:
+            # Only the new tasks are scheduled; the rest of the owner's schedule is untouched
+            self.scheduler.load(
+                (owner_id, task_id, row[4])
+                for task_id, row in zip(task_ids, chunk)
+                if row[4] and not row[2]
+            )
+        return len(task_ids)
+    
+    @staticmethod
+    def _import_timestamp(row: Dict[str, Any], column: str, label: str,
+                          earliest: Optional[datetime] = None, latest: Optional[datetime] = None) -> Optional[str]:
+        value = row.get(column) or None
+        if value is None:
+            return None
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"{label} must be an ISO 8601 date or datetime")
+        parsed = parsed.replace(tzinfo=None)
+        if (earliest and parsed < earliest) or (latest and parsed > latest):
+            raise ValueError(f"{label} must be between {earliest.year} and {latest.year}")
+        return parsed.strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _prepare_import_row(self, row: Dict[str, Any]) -> TaskRow:
+        if isinstance(row, ValueError):
+            raise row
+        
+        title = str(row.get('title') or '')
+        description = str(row.get('description') or '')
+        priority = row.get('priority') or 'normal'
+        self._validate_new_task(title, description, priority)
+        
+        completed = row.get('completed', False)
+        if isinstance(completed, str):
+            value = completed.strip().lower()
+            if value not in ('', '0', '1', 'true', 'false'):
+                raise ValueError("Completed must be true or false")
+            completed = value in ('1', 'true')
+        
+        due_date = self._import_timestamp(row, 'due_date', "Due date")
+        # Exported timestamps are restored so history and analytics survive a round trip;
+        # created_at and updated_at are TIMESTAMP columns and only hold this range
+        created_at = self._import_timestamp(row, 'created_at', "Created at", *TIMESTAMP_RANGE)
+        updated_at = self._import_timestamp(row, 'updated_at', "Updated at", *TIMESTAMP_RANGE)
+        completed_at = self._import_timestamp(row, 'completed_at', "Completed at") if completed else None
+        
+        return (title.strip(), description.strip(), bool(completed), priority, due_date,
+                created_at, updated_at, completed_at)
+    
+    def import_tasks(self, rows: Iterable[Tuple[int, Dict[str, Any]]], owner_id: str = DEFAULT_OWNER,
+                     chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        # rows are (line number, parsed row); a ValueError in place of a row reports a parse failure
+        processed = imported = failed = 0
+        chunk = []
+        
+        for line_number, row in rows:
+            processed += 1
+            try:
+                chunk.append(self._prepare_import_row(row))
+            except ValueError as e:
+                failed += 1
+                yield {'type': 'error', 'row': line_number, 'error': str(e)}
+            
+            if len(chunk) >= chunk_size:
+                imported += self._store_chunk(chunk, owner_id)
+                chunk = []
+                yield {'type': 'progress', 'processed': processed, 'imported': imported, 'failed': failed}
+        
+        if chunk:
+            imported += self._store_chunk(chunk, owner_id)
+        
+        yield {'type': 'summary', 'processed': processed, 'imported': imported, 'failed': failed}
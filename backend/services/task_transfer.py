@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Dict, IO, Iterable, Iterator, Tuple, Union
+
+
+EXPORT_COLUMNS = ['id', 'title', 'description', 'completed', 'priority', 'due_date', 'created_at', 'updated_at',
+                  'completed_at']
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def write_ndjson(tasks: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for task in tasks:
+        record = {column: _export_value(task.get(column)) for column in EXPORT_COLUMNS}
+        if record['completed'] is not None:
+            record['completed'] = bool(record['completed'])
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def write_csv(tasks: Iterable[Dict[str, Any]], rows_per_chunk: int = 500) -> Iterator[str]:
+    # Rows are written into a small reusable buffer and flushed every rows_per_chunk rows,
+    # which keeps the response chunked without one write call per row
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    
+    pending = 0
+    for task in tasks:
+        row = [_export_value(task.get(column)) for column in EXPORT_COLUMNS]
+        row[3] = 'true' if row[3] else 'false'
+        writer.writerow('' if value is None else value for value in row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def read_ndjson(stream: IO[str]) -> Iterator[Tuple[int, Union[Dict[str, Any], ValueError]]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ValueError(f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(row, dict):
+            yield line_number, ValueError("Each line must be a JSON object")
+            continue
+        yield line_number, row
+
+
+def read_csv(stream: IO[str]) -> Iterator[Tuple[int, Union[Dict[str, Any], ValueError]]]:
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None:
+        return
+    if 'title' not in reader.fieldnames:
+        yield 1, ValueError("CSV header must include a 'title' column")
+        return
+    
+    for row in reader:
+        if None in row:
+            yield reader.line_num, ValueError("Row has more fields than the header")
+            continue
+        yield reader.line_num, row
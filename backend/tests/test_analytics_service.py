@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from services.analytics_service import TaskAnalyticsService
+
+
+NOW = datetime(2024, 1, 10)
+
+
+def task(task_id, created_at, completed=False, completed_at=None, updated_at=None,
+         priority='normal', due_date=None):
+    return {
+        'id': task_id, 'completed': int(completed), 'priority': priority, 'due_date': due_date,
+        'created_at': created_at, 'updated_at': updated_at or completed_at or created_at,
+        'completed_at': completed_at,
+    }
+
+
+@pytest.fixture
+def tasks():
+    return [
+        task(1, datetime(2024, 1, 1), completed=True, completed_at=datetime(2024, 1, 1, 2)),
+        task(2, datetime(2024, 1, 1), priority='urgent', due_date=datetime(2024, 1, 5)),
+        task(3, datetime(2024, 1, 2), completed=True, completed_at=datetime(2024, 1, 4)),
+        task(4, datetime(2024, 1, 2), priority='low', due_date=datetime(2024, 1, 20)),
+        task(5, datetime(2024, 1, 3), completed=True, priority='urgent', due_date=datetime(2024, 1, 4),
+             updated_at=datetime(2024, 1, 3, 12)),
+    ]
+
+
+@pytest.fixture
+def mock_repository(tasks):
+    repository = Mock()
+    repository.find_updated_since.return_value = tasks
+    repository.count_all.return_value = len(tasks)
+    return repository
+
+
+@pytest.fixture
+def analytics(mock_repository):
+    return TaskAnalyticsService(mock_repository)
+
+
+class TestTaskAnalyticsService:
+    
+    def test_completion_rate_by_creation_day(self, analytics):
+        result = analytics.get_analytics(now=NOW)
+        
+        assert result['total'] == 5
+        assert result['completion_rate'] == [
+            {'period': '2024-01-01', 'created': 2, 'completion_rate': 0.5},
+            {'period': '2024-01-02', 'created': 2, 'completion_rate': 0.5},
+            {'period': '2024-01-03', 'created': 1, 'completion_rate': 1.0},
+        ]
+    
+    def test_time_to_complete_falls_back_to_updated_at(self, analytics):
+        result = analytics.get_analytics(now=NOW)['time_to_complete']
+        
+        assert result['count'] == 3
+        assert result['median_hours'] == 12.0
+        assert sum(bucket['count'] for bucket in result['histogram']) == 3
+    
+    def test_overdue_counts_only_open_tasks_past_due(self, analytics):
+        result = analytics.get_analytics(now=NOW)
+        
+        assert result['overdue_by_priority'] == {'low': 0, 'normal': 0, 'urgent': 1}
+    
+    def test_created_vs_completed_by_week(self, analytics):
+        result = analytics.get_analytics(bucket='week', now=NOW)
+        
+        assert result['created_vs_completed'] == [{'period': '2024-01-01', 'created': 5, 'completed': 3}]
+    
+    def test_rejects_unknown_bucket(self, analytics):
+        with pytest.raises(ValueError, match="Bucket must be"):
+            analytics.get_analytics(bucket='year')
+    
+    def test_refresh_only_reads_rows_updated_since_watermark(self, analytics, mock_repository):
+        analytics.get_analytics(now=NOW)
+        mock_repository.find_updated_since.return_value = [
+            task(2, datetime(2024, 1, 1), completed=True, completed_at=datetime(2024, 1, 6))
+        ]
+        
+        result = analytics.get_analytics(now=NOW)
+        
+        assert mock_repository.find_updated_since.call_args_list[0][0] == ('default', None)
+        assert mock_repository.find_updated_since.call_args_list[1][0] == (
+            'default', datetime(2024, 1, 4) - timedelta(seconds=5)
+        )
+        assert result['total'] == 5
+        assert result['overdue_by_priority']['urgent'] == 0
+        mock_repository.find_ids.assert_not_called()
+    
+    def test_refresh_drops_deleted_tasks(self, analytics, mock_repository):
+        analytics.get_analytics(now=NOW)
+        mock_repository.find_updated_since.return_value = []
+        mock_repository.count_all.return_value = 4
+        mock_repository.find_ids.return_value = [1, 3, 4, 5]
+        
+        result = analytics.get_analytics(now=NOW)
+        
+        assert result['total'] == 4
+        assert result['overdue_by_priority']['urgent'] == 0
+    
+    def test_refresh_adds_back_rows_committed_behind_the_watermark(self, analytics, mock_repository, tasks):
+        analytics.get_analytics(now=NOW)
+        late = task(6, datetime(2024, 1, 1), priority='urgent', due_date=datetime(2024, 1, 2))
+        mock_repository.find_updated_since.return_value = []
+        mock_repository.count_all.return_value = 6
+        mock_repository.find_ids.return_value = [1, 2, 3, 4, 5, 6]
+        mock_repository.find_snapshot_rows.return_value = [late]
+        
+        result = analytics.get_analytics(now=NOW)
+        
+        mock_repository.find_snapshot_rows.assert_called_once_with('default', [6])
+        assert result['total'] == 6
+        assert result['overdue_by_priority']['urgent'] == 2
+        
+        mock_repository.find_ids.reset_mock()
+        analytics.get_analytics(now=NOW)
+        mock_repository.find_ids.assert_not_called()
+    
+    def test_empty_owner_returns_zeroed_analytics(self, mock_repository):
+        mock_repository.find_updated_since.return_value = []
+        mock_repository.count_all.return_value = 0
+        
+        result = TaskAnalyticsService(mock_repository).get_analytics('nobody', now=NOW)
+        
+        assert result['total'] == 0
+        assert result['completion_rate'] == []
+        assert result['time_to_complete']['count'] == 0
+        assert result['created_vs_completed'] == []
+    
+    def test_snapshots_are_kept_per_owner_and_bounded(self, mock_repository):
+        analytics = TaskAnalyticsService(mock_repository, max_snapshots=2)
+        
+        for owner_id in ('a', 'b', 'c'):
+            analytics.get_analytics(owner_id, now=NOW)
+        
+        assert list(analytics._snapshots) == ['b', 'c']
@@ -0,0 +1,351 @@
+import threading
+import pytest
+from unittest.mock import Mock
+from mysql.connector import errors
+from config.circuit_breaker import CircuitBreaker, DatabaseUnavailableError, CLOSED, OPEN
+from config.database import DatabaseConfig, DatabaseConnection
+from repositories.task_repository import TaskRepository
+
+
+class StandInServer:
+    # Replaces mysql.connector.connect; set `down` to make connects and queries fail, or
+    # `hung` to make queries block like a black-holed server until the read timeout expires
+    
+    def __init__(self):
+        self.down = False
+        self.hung = False
+        self.release = threading.Event()
+        self.connections = []
+        self.committed = []
+    
+    @property
+    def connects(self) -> int:
+        return len(self.connections)
+    
+    def connect(self, **kwargs):
+        if self.down:
+            raise errors.InterfaceError("Can't connect to MySQL server", errno=2003)
+        connection = StandInConnection(self, kwargs)
+        self.connections.append(connection)
+        return connection
+
+
+class StandInConnection:
+    
+    def __init__(self, server: StandInServer, settings: dict):
+        self.server = server
+        self.settings = settings
+        self.dropped = False
+        self.pending = []
+        self.pings = 0
+        # Outside autocommit the first statement opens a transaction that lasts until
+        # commit or rollback, as InnoDB does
+        self.in_transaction = False
+    
+    def check(self):
+        if self.server.hung:
+            # Without a read timeout the socket read never returns
+            self.server.release.wait(self.settings.get('read_timeout'))
+            raise errors.ReadTimeoutError(errno=3024)
+        if self.server.down or self.dropped:
+            raise errors.OperationalError("Lost connection to MySQL server during query", errno=2013)
+    
+    def is_connected(self) -> bool:
+        self.pings += 1
+        return not (self.server.down or self.dropped)
+    
+    def cursor(self, **kwargs):
+        return StandInCursor(self)
+    
+    def commit(self):
+        self.check()
+        self.server.committed.extend(self.pending)
+        self.pending = []
+        self.in_transaction = False
+    
+    def rollback(self):
+        self.pending = []
+        self.in_transaction = False
+    
+    def close(self):
+        pass
+
+
+class StandInCursor:
+    
+    def __init__(self, connection: StandInConnection):
+        self.connection = connection
+        self.column_names = ('id', 'title')
+        self.rowcount = 1
+        self.lastrowid = 7
+    
+    def execute(self, query, params=None):
+        self.connection.check()
+        if not self.connection.settings.get('autocommit'):
+            self.connection.in_transaction = True
+        if query.startswith('INSERT'):
+            self.connection.pending.append(params)
+    
+    def fetchall(self):
+        return [(1, 'Task')]
+    
+    def fetchmany(self, size=None):
+        return []
+    
+    def fetchone(self):
+        return {'count': 1}
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = StandInServer()
+    monkeypatch.setattr('config.database.mysql.connector.connect', server.connect)
+    return server
+
+
+@pytest.fixture
+def connection(server, monkeypatch):
+    monkeypatch.setenv('DB_BREAKER_FAILURES', '2')
+    monkeypatch.setenv('DB_BREAKER_RESET_SECONDS', '60')
+    monkeypatch.setenv('DB_READ_TIMEOUT', '1')
+    connection = DatabaseConnection(DatabaseConfig(), use_breaker=True)
+    connection.connect()
+    return connection
+
+
+@pytest.fixture
+def repository(connection):
+    return TaskRepository(connection)
+
+
+def recover(connection):
+    connection.breaker.probe_now()
+    assert connection.breaker.wait_for_probe(timeout=5)
+
+
+class TestCircuitBreaker:
+    
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker('db', probe=Mock(), failure_threshold=2, reset_timeout=60)
+        failing = Mock(side_effect=ConnectionError("down"))
+        
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                breaker.call(failing)
+        
+        assert breaker.state == OPEN
+        with pytest.raises(DatabaseUnavailableError):
+            breaker.call(failing)
+        assert failing.call_count == 2
+    
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker('db', probe=Mock(), failure_threshold=2)
+        
+        with pytest.raises(ConnectionError):
+            breaker.call(Mock(side_effect=ConnectionError()))
+        breaker.call(Mock())
+        with pytest.raises(ConnectionError):
+            breaker.call(Mock(side_effect=ConnectionError()))
+        
+        assert breaker.state == CLOSED
+    
+    def test_non_failure_errors_do_not_count(self):
+        breaker = CircuitBreaker('db', probe=Mock(), is_failure=lambda e: isinstance(e, ConnectionError),
+                                 failure_threshold=1)
+        
+        with pytest.raises(ValueError):
+            breaker.call(Mock(side_effect=ValueError()))
+        
+        assert breaker.state == CLOSED
+    
+    def test_failed_probe_keeps_circuit_open_until_success(self):
+        probe = Mock(side_effect=[ConnectionError("still down"), None])
+        breaker = CircuitBreaker('db', probe=probe, failure_threshold=1, reset_timeout=60)
+        
+        with pytest.raises(ConnectionError):
+            breaker.call(Mock(side_effect=ConnectionError()))
+        breaker.probe_now()
+        assert not breaker.wait_for_probe(timeout=0.2)
+        assert breaker.state == OPEN
+        
+        breaker.probe_now()
+        assert breaker.wait_for_probe(timeout=5)
+        
+        assert breaker.state == CLOSED
+        assert probe.call_count == 2
+        assert breaker.metrics()['transitions'] == {
+            'closed->open': 1, 'open->half_open': 2, 'half_open->open': 1, 'half_open->closed': 1
+        }
+
+
+class TestDatabaseOutage:
+    
+    def test_outage_trips_circuit_and_fails_fast(self, server, connection, repository):
+        server.down = True
+        
+        for _ in range(2):
+            with pytest.raises(errors.Error):
+                repository.find_all()
+        connects_before = server.connects
+        
+        with pytest.raises(DatabaseUnavailableError):
+            repository.find_all()
+        
+        assert connection.breaker.state == OPEN
+        assert not connection.is_available()
+        assert server.connects == connects_before
+        assert connection.breaker.metrics()['rejected_calls'] == 1
+    
+    def test_every_connection_sets_query_timeouts(self, server, connection, repository):
+        server.connections[0].dropped = True
+        with pytest.raises(errors.Error):
+            repository.find_all()
+        repository.find_all()
+        
+        assert server.connects == 2
+        for stand_in in server.connections:
+            assert stand_in.settings['read_timeout'] == 1
+            assert stand_in.settings['write_timeout'] == 30
+            assert stand_in.settings['connection_timeout'] == 3
+    
+    def test_hung_server_times_out_and_trips_circuit(self, server, connection, repository):
+        server.hung = True
+        outcomes = []
+        
+        def read():
+            for _ in range(2):
+                try:
+                    repository.find_all()
+                except Exception as e:
+                    outcomes.append(e)
+        
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+        reader.join(10)
+        server.release.set()
+        
+        assert not reader.is_alive(), "query blocked on a hung server"
+        assert [type(e) for e in outcomes] == [errors.ReadTimeoutError, errors.ReadTimeoutError]
+        assert connection.breaker.state == OPEN
+    
+    def test_probe_keeps_circuit_open_while_server_accepts_but_hangs(self, server, connection, repository):
+        server.hung = True
+        for _ in range(2):
+            with pytest.raises(errors.ReadTimeoutError):
+                repository.count_all()
+        
+        connection.breaker.probe_now()
+        assert not connection.breaker.wait_for_probe(timeout=3)
+        assert connection.breaker.state != CLOSED
+        
+        server.hung = False
+        recover(connection)
+        assert repository.count_all() == 1
+    
+    def test_recovers_through_single_background_probe(self, server, connection, repository):
+        server.down = True
+        for _ in range(2):
+            with pytest.raises(errors.Error):
+                repository.count_all()
+        
+        server.down = False
+        recover(connection)
+        
+        assert connection.breaker.state == CLOSED
+        assert repository.count_all() == 1
+    
+    def test_probe_failure_during_outage_stays_open(self, server, connection, repository):
+        server.down = True
+        for _ in range(2):
+            with pytest.raises(errors.Error):
+                repository.count_all()
+        
+        connection.breaker.probe_now()
+        assert not connection.breaker.wait_for_probe(timeout=0.2)
+        
+        assert connection.breaker.state == OPEN
+        with pytest.raises(DatabaseUnavailableError):
+            repository.count_all()
+        
+        server.down = False
+        recover(connection)
+        assert repository.count_all() == 1
+    
+    def test_connection_dropped_before_commit_raises_instead_of_reconnecting(self, server, connection,
+                                                                             repository, monkeypatch):
+        monkeypatch.setattr(repository, 'find_by_id', lambda task_id, owner_id: {'id': task_id})
+        original_execute = StandInCursor.execute
+        
+        def execute_then_drop(cursor, query, params=None):
+            original_execute(cursor, query, params)
+            cursor.connection.dropped = True
+        
+        monkeypatch.setattr(StandInCursor, 'execute', execute_then_drop)
+        
+        with pytest.raises(errors.OperationalError):
+            repository.create("Task", "")
+        
+        assert server.connects == 1
+        assert server.committed == []
+        assert connection.breaker.consecutive_failures == 1
+    
+    def test_commit_after_reconnect_by_another_cursor_raises(self, server, connection, repository):
+        cursor = connection.cursor()
+        cursor.execute("INSERT INTO task (title) VALUES (%s)", ("lost",))
+        server.connections[0].dropped = True
+        with pytest.raises(errors.Error):
+            connection.cursor().execute("SELECT 1")
+        connection.get_connection()
+        
+        with pytest.raises(errors.OperationalError):
+            connection.commit()
+        
+        assert server.connects == 2
+        assert server.committed == []
+    
+    def test_queries_do_not_ping_and_reconnect_after_failure(self, server, connection, repository):
+        repository.find_all()
+        repository.count_all()
+        assert sum(c.pings for c in server.connections) == 0
+        
+        server.connections[0].dropped = True
+        with pytest.raises(errors.Error):
+            repository.find_all()
+        
+        assert len(repository.find_all()) == 1
+        assert server.connects == 2
+    
+    def test_export_fails_fast_with_503(self, server, connection, repository):
+        from flask import Flask
+        from controllers.task_controller import TaskController
+        from services.task_service import TaskService
+        
+        app = Flask(__name__)
+        app.register_blueprint(TaskController(TaskService(repository)).blueprint)
+        client = app.test_client()
+        server.down = True
+        for _ in range(2):
+            client.get('/tasks')
+        
+        response = client.get('/tasks/export')
+        
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '60'
+    
+    def test_controller_returns_503_while_open(self, server, connection, repository):
+        from flask import Flask
+        from controllers.task_controller import TaskController
+        from services.task_service import TaskService
+        
+        app = Flask(__name__)
+        app.register_blueprint(TaskController(TaskService(repository)).blueprint)
+        client = app.test_client()
+        server.down = True
+        
+        statuses = [client.get('/tasks').status_code for _ in range(3)]
+        
+        assert statuses == [500, 500, 503]
+        assert client.get('/tasks/stats').headers['Retry-After'] == '60'
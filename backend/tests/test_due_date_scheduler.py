@@ -0,0 +1,160 @@
+import threading
+import pytest
+from datetime import datetime, timedelta
+from services.due_date_scheduler import DueDateScheduler
+
+
+START = datetime(2024, 1, 1, 12, 0)
+
+
+class FakeClock:
+    
+    def __init__(self, now: datetime):
+        self.now = now.timestamp()
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs).total_seconds()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(START)
+
+
+@pytest.fixture
+def scheduler(clock):
+    return DueDateScheduler(reminder_lead=timedelta(hours=1), clock=clock)
+
+
+def fired(events):
+    return [(event['type'], event['owner_id'], event['task_id']) for event in events]
+
+
+class TestDueDateScheduler:
+    
+    def test_fires_reminder_then_overdue(self, scheduler, clock):
+        scheduler.schedule('alice', 1, START + timedelta(hours=3))
+        
+        clock.advance(hours=1)
+        assert scheduler.pop_due() == []
+        
+        clock.advance(hours=1)
+        assert fired(scheduler.pop_due()) == [('due', 'alice', 1)]
+        
+        clock.advance(hours=1)
+        assert fired(scheduler.pop_due()) == [('overdue', 'alice', 1)]
+        assert len(scheduler) == 0
+    
+    def test_task_inside_reminder_window_only_goes_overdue(self, scheduler, clock):
+        scheduler.schedule('alice', 1, START + timedelta(minutes=30))
+        
+        clock.advance(hours=1)
+        
+        assert fired(scheduler.pop_due()) == [('overdue', 'alice', 1)]
+    
+    def test_past_due_and_undated_tasks_are_not_scheduled(self, scheduler):
+        scheduler.schedule('alice', 1, START - timedelta(days=1))
+        scheduler.schedule('alice', 2, None)
+        
+        assert len(scheduler) == 0
+    
+    def test_reschedule_replaces_previous_due_date(self, scheduler, clock):
+        scheduler.schedule('alice', 1, START + timedelta(hours=2))
+        scheduler.schedule('alice', 1, START + timedelta(days=2))
+        
+        clock.advance(hours=3)
+        
+        assert scheduler.pop_due() == []
+        assert scheduler.next_fire_time() == (START + timedelta(days=2, hours=-1)).timestamp()
+    
+    def test_completing_or_deleting_cancels_events(self, scheduler, clock):
+        scheduler.schedule('alice', 1, START + timedelta(hours=2))
+        scheduler.schedule('alice', 2, START + timedelta(hours=2))
+        
+        scheduler.schedule('alice', 1, START + timedelta(hours=2), completed=True)
+        scheduler.unschedule('alice', 2)
+        clock.advance(hours=3)
+        
+        assert scheduler.pop_due() == []
+    
+    def test_same_task_id_on_different_owners_is_tracked_separately(self, scheduler, clock):
+        scheduler.schedule('alice', 1, START + timedelta(hours=2))
+        scheduler.schedule('bob', 1, START + timedelta(hours=2))
+        scheduler.unschedule('alice', 1)
+        
+        clock.advance(hours=1)
+        
+        assert fired(scheduler.pop_due()) == [('due', 'bob', 1)]
+    
+    def test_load_accepts_iso_strings_and_orders_events(self, scheduler, clock):
+        scheduler.load([
+            ('alice', 2, (START + timedelta(hours=5)).isoformat()),
+            ('alice', 1, START + timedelta(hours=2)),
+            ('bob', 3, None),
+        ])
+        
+        clock.advance(hours=5)
+        
+        assert fired(scheduler.pop_due()) == [
+            ('due', 'alice', 1), ('overdue', 'alice', 1), ('due', 'alice', 2), ('overdue', 'alice', 2)
+        ]
+    
+    def test_stale_entries_are_compacted(self, scheduler):
+        for version in range(3000):
+            scheduler.schedule('alice', 1, START + timedelta(days=1, seconds=version))
+        
+        assert len(scheduler._heap) <= 1025
+    
+    def test_reloading_scheduled_tasks_compacts_the_heap(self, scheduler):
+        tasks = [('alice', task_id, START + timedelta(days=2)) for task_id in range(2000)]
+        
+        for _ in range(5):
+            scheduler.load(tasks)
+        
+        assert len(scheduler) == 2000
+        assert len(scheduler._heap) <= 4000
+    
+    def test_load_reads_rows_before_taking_the_lock(self, scheduler):
+        acquired = []
+        
+        def try_lock():
+            # The condition's lock is reentrant, so it has to be probed from another thread
+            if scheduler._condition.acquire(blocking=False):
+                acquired.append(True)
+                scheduler._condition.release()
+        
+        def rows():
+            probe = threading.Thread(target=try_lock)
+            probe.start()
+            probe.join()
+            yield ('alice', 1, START + timedelta(hours=2))
+        
+        scheduler.load(rows())
+        
+        assert acquired == [True]
+        assert len(scheduler) == 1
+    
+    def test_load_drops_tasks_that_no_longer_fire(self, scheduler, clock):
+        scheduler.schedule('alice', 1, START + timedelta(hours=2))
+        
+        scheduler.load([('alice', 1, None)])
+        clock.advance(hours=3)
+        
+        assert scheduler.pop_due() == []
+    
+    def test_background_thread_dispatches_to_listeners(self):
+        received = threading.Event()
+        events = []
+        scheduler = DueDateScheduler(reminder_lead=timedelta(0))
+        scheduler.add_listener(lambda event: (events.append(event), received.set()))
+        scheduler.start()
+        try:
+            scheduler.schedule('alice', 1, datetime.now() + timedelta(milliseconds=50))
+            assert received.wait(timeout=5)
+        finally:
+            scheduler.stop()
+        
+        assert fired(events) == [('overdue', 'alice', 1)]
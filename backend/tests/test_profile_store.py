@@ -0,0 +1,46 @@
+import cProfile
+import os
+import pytest
+from services.profile_store import ProfileStore
+
+
+def make_profile():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    sorted(range(100))
+    profiler.disable()
+    return profiler
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path), max_profiles=3)
+
+
+class TestProfileStore:
+    
+    def test_save_and_read_back(self, store):
+        profile_id = store.new_id()
+        
+        store.save(profile_id, make_profile(), {'id': profile_id, 'path': '/tasks'})
+        
+        assert store.get(profile_id) == {'id': profile_id, 'path': '/tasks'}
+        assert os.path.getsize(store.stats_path(profile_id)) > 0
+    
+    def test_keeps_only_newest_profiles(self, store):
+        ids = [f"{1700000000000 + index:013d}-0000000{index}" for index in range(5)]
+        
+        for profile_id in ids:
+            store.save(profile_id, make_profile(), {'id': profile_id})
+        
+        assert [summary['id'] for summary in store.list_profiles()] == list(reversed(ids[2:]))
+        assert store.stats_path(ids[0]) is None
+        assert len(os.listdir(store.directory)) == 6
+    
+    def test_missing_profile(self, store):
+        assert store.get('1700000000000-00000000') is None
+        assert store.stats_path('1700000000000-00000000') is None
+    
+    def test_rejects_ids_outside_the_store(self, store):
+        with pytest.raises(ValueError):
+            store.get('../../etc/passwd')
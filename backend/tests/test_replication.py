@@ -0,0 +1,209 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from config.database import DatabaseConfig, DatabaseConnection
+from config.replication import ReplicaSet, session_token
+from repositories.task_repository import TaskRepository
+from tests.test_circuit_breaker import StandInServer
+
+
+def make_connection(host):
+    connection = Mock()
+    connection.config.host = host
+    connection.is_available.return_value = True
+    connection.cursor.return_value.fetchall.return_value = []
+    return connection
+
+
+@pytest.fixture
+def primary():
+    return make_connection('primary')
+
+
+@pytest.fixture
+def replicas():
+    return [make_connection('replica-a'), make_connection('replica-b')]
+
+
+@pytest.fixture
+def lag():
+    # Simulated replication lag per replica host, mutated by the tests
+    return {'replica-a': 0.0, 'replica-b': 0.0}
+
+
+@pytest.fixture
+def replica_set(primary, replicas, lag):
+    return ReplicaSet(primary, replicas, max_lag_seconds=5.0, health_check_interval=0,
+                      lag_probe=lambda replica: lag[replica.config.host])
+
+
+@pytest.fixture(autouse=True)
+def reset_session():
+    token = session_token.set(None)
+    yield
+    session_token.reset(token)
+
+
+class TestReplicaSet:
+    
+    def test_reads_are_balanced_across_replicas(self, replica_set, replicas):
+        readers = {replica_set.reader() for _ in range(4)}
+        
+        assert readers == {replica for replica in replicas}
+    
+    def test_writer_is_primary(self, replica_set, primary):
+        assert replica_set.writer() is primary
+    
+    def test_lagging_replica_is_skipped(self, replica_set, replicas, lag):
+        lag['replica-a'] = 30.0
+        
+        readers = {replica_set.reader() for _ in range(4)}
+        
+        assert readers == {replicas[1]}
+    
+    def test_unreachable_replica_is_skipped(self, replica_set, replicas, lag):
+        lag['replica-b'] = None
+        
+        assert replica_set.reader() is replicas[0]
+    
+    def test_replica_with_open_circuit_is_skipped(self, replica_set, replicas):
+        replicas[0].is_available.return_value = False
+        
+        readers = {replica_set.reader() for _ in range(4)}
+        
+        assert readers == {replicas[1]}
+    
+    def test_failing_probe_marks_replica_unhealthy(self, primary, replicas):
+        def probe(replica):
+            raise ConnectionError("down")
+        replica_set = ReplicaSet(primary, replicas, health_check_interval=0, lag_probe=probe)
+        
+        assert replica_set.reader() is primary
+        assert all(not status['healthy'] for status in replica_set.status())
+    
+    def test_recent_write_pins_session_to_primary(self, replica_set, primary):
+        token = replica_set.record_write()
+        
+        assert session_token.get() == token
+        assert replica_set.reader(token) is primary
+    
+    def test_session_reads_replica_once_it_has_caught_up(self, replica_set, replicas, lag):
+        lag['replica-a'] = 3.0
+        token = f"{time.time() - 2.0:.6f}"
+        
+        assert replica_set.reader(token) is replicas[1]
+    
+    def test_invalid_token_is_ignored(self, replica_set, replicas):
+        assert replica_set.reader('not-a-token') in {r for r in replicas}
+    
+    def test_non_finite_token_is_ignored(self, replica_set, replicas):
+        assert replica_set.reader('inf') in {r for r in replicas}
+        assert replica_set.reader('nan') in {r for r in replicas}
+    
+    def test_far_future_token_does_not_pin_session(self, replica_set, replicas):
+        token = f"{time.time() + 3600:.6f}"
+        
+        assert replica_set.reader(token) in {r for r in replicas}
+    
+    def test_token_slightly_ahead_is_treated_as_a_fresh_write(self, replica_set, primary):
+        token = f"{time.time() + 1.0:.6f}"
+        
+        assert replica_set.reader(token) is primary
+    
+    def test_only_one_request_probes_at_a_time(self, primary, replicas):
+        probing = threading.Event()
+        release = threading.Event()
+        probe = Mock(return_value=0.0)
+        
+        def slow_probe(replica):
+            probing.set()
+            release.wait(5)
+            return probe(replica)
+        replica_set = ReplicaSet(primary, replicas, health_check_interval=60, lag_probe=slow_probe)
+        first = threading.Thread(target=replica_set.reader)
+        first.start()
+        probing.wait(5)
+        
+        # No lag is known yet, so the concurrent read goes to the primary without probing
+        assert replica_set.reader() is primary
+        release.set()
+        first.join()
+        
+        assert probe.call_count == len(replicas)
+    
+    def test_health_is_cached_between_checks(self, primary, replicas):
+        probe = Mock(return_value=0.0)
+        replica_set = ReplicaSet(primary, replicas, health_check_interval=60, lag_probe=probe)
+        
+        replica_set.reader()
+        replica_set.reader()
+        
+        assert probe.call_count == len(replicas)
+    
+    def test_measure_lag_reads_replica_status(self):
+        replica = make_connection('replica')
+        cursor = replica.cursor.return_value
+        cursor.fetchone.return_value = {
+            'Replica_IO_Running': 'Yes', 'Replica_SQL_Running': 'Yes', 'Seconds_Behind_Source': 2
+        }
+        
+        assert ReplicaSet.measure_lag(replica) == 2.0
+        cursor.execute.assert_called_once_with("SHOW REPLICA STATUS")
+    
+    def test_measure_lag_reports_stopped_replication(self):
+        replica = make_connection('replica')
+        cursor = replica.cursor.return_value
+        cursor.fetchone.return_value = {
+            'Replica_IO_Running': 'No', 'Replica_SQL_Running': 'Yes', 'Seconds_Behind_Source': None
+        }
+        
+        assert ReplicaSet.measure_lag(replica) is None
+
+
+class TestRepositoryReplicaRouting:
+    
+    def test_reads_go_to_replica_and_writes_to_primary(self, replica_set, replicas):
+        db = Mock()
+        db.cursor.return_value.rowcount = 1
+        repository = TaskRepository(db, replica_set)
+        
+        repository.find_all()
+        
+        db.cursor.assert_not_called()
+        replica_reads = sum(r.cursor.call_count for r in replicas)
+        assert replica_reads == 1
+        
+        repository.delete(1)
+        
+        db.cursor.assert_called_once_with(dictionary=True)
+        db.commit.assert_called_once()
+        assert session_token.get() is not None
+    
+    def test_read_after_write_uses_primary(self, replica_set, primary):
+        db = Mock()
+        db.cursor.return_value.rowcount = 1
+        repository = TaskRepository(db, replica_set)
+        
+        repository.delete(1)
+        repository.find_by_id(1)
+        
+        primary.cursor.assert_called_once_with(dictionary=True)
+    
+    def test_replica_reads_do_not_hold_a_transaction_open(self, monkeypatch):
+        # A replica connection left inside a transaction keeps serving the snapshot of its
+        # first SELECT, however far replication has moved on since
+        server = StandInServer()
+        monkeypatch.setattr('config.database.mysql.connector.connect', server.connect)
+        monkeypatch.setenv('DB_REPLICAS', 'replica-a:3306')
+        config = DatabaseConfig()
+        primary = DatabaseConnection(config, use_breaker=True)
+        replicas = [DatabaseConnection(replica, use_breaker=True) for replica in config.replica_configs()]
+        repository = TaskRepository(primary, ReplicaSet(primary, replicas, lag_probe=lambda replica: 0.0))
+        
+        repository.find_all()
+        repository.count_all()
+        
+        replica_connections = [c for c in server.connections if c.settings['host'] == 'replica-a']
+        assert replica_connections
+        assert not any(c.in_transaction for c in replica_connections)
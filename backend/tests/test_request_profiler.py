@@ -0,0 +1,150 @@
+import pstats
+import pytest
+from flask import Flask, jsonify
+from config.profiling import ProfilingConfig
+from controllers.profile_controller import ProfileController, PROFILE_HEADER, PROFILE_ID_HEADER
+from services.profile_store import ProfileStore
+from services.request_profiler import RequestProfiler, breakdown, categorize, collapsed_stacks
+
+
+TOKEN = 'secret'
+
+MYSQL_EXECUTE = ('/site-packages/mysql/connector/cursor.py', 10, 'execute')
+SOCKET_RECV = ('~', 0, "<method 'recv_into' of '_socket.socket' objects>")
+JSON_ENCODE = ('/lib/json/encoder.py', 20, 'encode')
+RECORD_TO_JSON = ('/backend/repositories/task_record.py', 90, 'to_json')
+SERVICE_CALL = ('/backend/services/task_service.py', 30, 'get_all_tasks')
+
+
+def load_tasks():
+    return [{'id': task_id, 'title': f"Task {task_id}"} for task_id in range(200)]
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    config = ProfilingConfig(token=TOKEN, sample_rate=0, directory=str(tmp_path))
+    return RequestProfiler(config, ProfileStore(str(tmp_path), max_profiles=10))
+
+
+@pytest.fixture
+def client(profiler):
+    app = Flask(__name__)
+    app.register_blueprint(ProfileController(profiler).blueprint)
+    app.add_url_rule('/tasks', view_func=lambda: jsonify(load_tasks()))
+    return app.test_client()
+
+
+class TestTimeBreakdown:
+    
+    def test_categorizes_by_module(self):
+        assert categorize(MYSQL_EXECUTE) == 'db'
+        assert categorize(SOCKET_RECV) == 'db'
+        assert categorize(JSON_ENCODE) == 'serialization'
+        assert categorize(RECORD_TO_JSON) == 'serialization'
+        assert categorize(SERVICE_CALL) == 'python'
+    
+    def test_own_time_is_split_into_buckets(self):
+        stats = {
+            SERVICE_CALL: (1, 1, 0.010, 0.100, {}),
+            MYSQL_EXECUTE: (1, 1, 0.020, 0.070, {SERVICE_CALL: (1, 1, 0.020, 0.070)}),
+            SOCKET_RECV: (3, 3, 0.050, 0.050, {MYSQL_EXECUTE: (3, 3, 0.050, 0.050)}),
+            JSON_ENCODE: (1, 1, 0.020, 0.020, {SERVICE_CALL: (1, 1, 0.020, 0.020)}),
+        }
+        
+        assert breakdown(stats) == {'python_ms': 10.0, 'db_ms': 70.0, 'serialization_ms': 20.0}
+    
+    def test_collapsed_stacks_split_time_along_call_edges(self):
+        stats = {
+            SERVICE_CALL: (1, 1, 0.010, 0.100, {}),
+            MYSQL_EXECUTE: (1, 1, 0.070, 0.070, {SERVICE_CALL: (1, 1, 0.070, 0.070)}),
+            JSON_ENCODE: (1, 1, 0.020, 0.020, {SERVICE_CALL: (1, 1, 0.020, 0.020)}),
+        }
+        
+        assert collapsed_stacks(stats).splitlines() == [
+            'get_all_tasks (task_service.py:30) 10000',
+            'get_all_tasks (task_service.py:30);encode (encoder.py:20) 20000',
+            'get_all_tasks (task_service.py:30);execute (cursor.py:10) 70000',
+        ]
+    
+    def test_recursive_calls_do_not_loop(self):
+        recursive = ('/backend/walk.py', 1, 'walk')
+        stats = {recursive: (2, 5, 0.050, 0.050, {recursive: (4, 4, 0.040, 0.040)})}
+        
+        assert collapsed_stacks(stats) == ''
+
+
+class TestRequestProfiler:
+    
+    def test_selects_privileged_header_or_sample(self, tmp_path):
+        config = ProfilingConfig(token=TOKEN, sample_rate=0.1, directory=str(tmp_path))
+        draws = iter([0.05, 0.5])
+        profiler = RequestProfiler(config, sample=lambda: next(draws))
+        
+        assert profiler.select(TOKEN) == 'header'
+        assert profiler.select('wrong') == 'sample'
+        assert profiler.select(None) is None
+    
+    def test_only_one_request_is_profiled_at_a_time(self, profiler):
+        run = profiler.start('header')
+        try:
+            assert profiler.start('header') is None
+        finally:
+            profiler.abandon(run)
+        
+        profiler.abandon(profiler.start('header'))
+    
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv('PROFILE_TOKEN', raising=False)
+        monkeypatch.delenv('PROFILE_SAMPLE_RATE', raising=False)
+        
+        assert not ProfilingConfig().enabled
+    
+    def test_invalid_sample_rate(self):
+        with pytest.raises(ValueError):
+            ProfilingConfig(sample_rate=2)
+
+
+class TestProfileController:
+    
+    def test_privileged_request_is_profiled_and_downloadable(self, client):
+        response = client.get('/tasks', headers={PROFILE_HEADER: TOKEN})
+        profile_id = response.headers[PROFILE_ID_HEADER]
+        headers = {PROFILE_HEADER: TOKEN}
+        
+        summary = client.get(f'/debug/profiles/{profile_id}', headers=headers).get_json()
+        listed = client.get('/debug/profiles', headers=headers).get_json()
+        pstats_download = client.get(f'/debug/profiles/{profile_id}/download', headers=headers)
+        collapsed = client.get(f'/debug/profiles/{profile_id}/download?format=collapsed', headers=headers)
+        
+        assert response.status_code == 200 and len(response.get_json()) == 200
+        assert summary['path'] == '/tasks' and summary['status'] == 200 and summary['trigger'] == 'header'
+        assert summary['serialization_ms'] > 0
+        assert summary['wall_ms'] >= summary['python_ms'] + summary['db_ms'] + summary['serialization_ms'] - 1
+        assert [profile['id'] for profile in listed] == [profile_id]
+        assert pstats_download.status_code == 200 and pstats_download.data
+        assert 'load_tasks (test_request_profiler.py' in collapsed.get_data(as_text=True)
+    
+    def test_unselected_requests_are_not_profiled(self, client):
+        response = client.get('/tasks', headers={PROFILE_HEADER: 'wrong'})
+        
+        assert PROFILE_ID_HEADER not in response.headers
+        assert client.get('/debug/profiles', headers={PROFILE_HEADER: TOKEN}).get_json() == []
+    
+    def test_profile_endpoints_require_token(self, client):
+        assert client.get('/debug/profiles').status_code == 403
+        assert client.get('/debug/profiles', headers={PROFILE_HEADER: 'wrong'}).status_code == 403
+    
+    def test_unknown_profile_and_format(self, client):
+        headers = {PROFILE_HEADER: TOKEN}
+        profile_id = client.get('/tasks', headers=headers).headers[PROFILE_ID_HEADER]
+        
+        assert client.get('/debug/profiles/1700000000000-00000000', headers=headers).status_code == 404
+        assert client.get('/debug/profiles/not-an-id', headers=headers).status_code == 400
+        assert client.get(f'/debug/profiles/{profile_id}/download?format=svg', headers=headers).status_code == 400
+    
+    def test_stored_pstats_load(self, client, profiler):
+        profile_id = client.get('/tasks', headers={PROFILE_HEADER: TOKEN}).headers[PROFILE_ID_HEADER]
+        
+        stats = pstats.Stats(profiler.store.stats_path(profile_id))
+        
+        assert any(function[2] == 'load_tasks' for function in stats.stats)
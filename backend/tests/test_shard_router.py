@@ -0,0 +1,194 @@
+import json
+import pytest
+from datetime import datetime
+from repositories.shard_router import ShardRouter, ConsistentHashRing
+from services.task_service import TaskService
+
+
+SHARD_NAMES = ('shard-a', 'shard-b', 'shard-c')
+OWNERS = [f"user-{i}" for i in range(30)]
+
+
+class FileBackedShard:
+    # Stand-in for one shard's TaskRepository: its own JSON file and its own id sequence,
+    # with the same owner scoping as the SQL queries
+    
+    def __init__(self, path):
+        self.path = path
+        self._save({'next_id': 1, 'rows': []})
+    
+    def _load(self):
+        with open(self.path) as file:
+            return json.load(file)
+    
+    def _save(self, data):
+        with open(self.path, 'w') as file:
+            json.dump(data, file)
+    
+    def _owned(self, owner_id):
+        return [row for row in self._load()['rows'] if row['owner_id'] == owner_id]
+    
+    def owners(self):
+        return {row['owner_id'] for row in self._load()['rows']}
+    
+    def create(self, title, description, completed=False, priority='normal', due_date=None,
+               owner_id='default'):
+        data = self._load()
+        task_id = data['next_id']
+        data['next_id'] += 1
+        data['rows'].append({'id': task_id, 'owner_id': owner_id, 'title': title, 'description': description,
+                             'completed': completed, 'priority': priority, 'due_date': due_date})
+        self._save(data)
+        return task_id
+    
+    def find_all(self, owner_id='default'):
+        return list(reversed(self._owned(owner_id)))
+    
+    def find_by_id(self, task_id, owner_id='default'):
+        return next((row for row in self._owned(owner_id) if row['id'] == task_id), None)
+    
+    def update(self, task_id, title=None, description=None, completed=None, priority=None, due_date=None,
+               owner_id='default'):
+        data = self._load()
+        for row in data['rows']:
+            if row['id'] == task_id and row['owner_id'] == owner_id:
+                if title is not None:
+                    row['title'] = title
+                if completed is not None:
+                    row['completed'] = completed
+                self._save(data)
+                return True
+        return False
+    
+    def delete(self, task_id, owner_id='default'):
+        data = self._load()
+        kept = [row for row in data['rows'] if not (row['id'] == task_id and row['owner_id'] == owner_id)]
+        deleted = len(kept) != len(data['rows'])
+        data['rows'] = kept
+        self._save(data)
+        return deleted
+    
+    def count_all(self, owner_id='default'):
+        return len(self._owned(owner_id))
+    
+    def count_by_status(self, completed, owner_id='default'):
+        return sum(1 for row in self._owned(owner_id) if bool(row['completed']) == completed)
+    
+    def iter_scheduled(self, owner_id=None, batch_size=10000):
+        for row in self._load()['rows']:
+            if row['due_date'] and not row['completed'] and owner_id in (None, row['owner_id']):
+                yield row['owner_id'], row['id'], datetime.fromisoformat(row['due_date'])
+
+
+@pytest.fixture
+def shards(tmp_path):
+    return {name: FileBackedShard(tmp_path / f"{name}.json") for name in SHARD_NAMES}
+
+
+@pytest.fixture
+def router(shards):
+    return ShardRouter(shards)
+
+
+class TestConsistentHashRing:
+    
+    def test_same_key_always_maps_to_same_node(self):
+        ring = ConsistentHashRing(['a', 'b', 'c'])
+        
+        assert ring.get_node('alice') == ring.get_node('alice')
+    
+    def test_keys_are_spread_across_nodes(self):
+        ring = ConsistentHashRing(['a', 'b', 'c'])
+        
+        placements = [ring.get_node(f"user-{i}") for i in range(3000)]
+        
+        for node in ('a', 'b', 'c'):
+            assert placements.count(node) > 600
+    
+    def test_adding_node_only_moves_keys_to_new_node(self):
+        ring = ConsistentHashRing(['a', 'b', 'c'])
+        keys = [f"user-{i}" for i in range(2000)]
+        before = {key: ring.get_node(key) for key in keys}
+        
+        ring.add_node('d')
+        after = {key: ring.get_node(key) for key in keys}
+        
+        moved = [key for key in keys if before[key] != after[key]]
+        assert all(after[key] == 'd' for key in moved)
+        assert len(moved) < len(keys) / 2
+    
+    def test_removing_node_restores_previous_placement(self):
+        ring = ConsistentHashRing(['a', 'b'])
+        keys = [f"user-{i}" for i in range(500)]
+        before = {key: ring.get_node(key) for key in keys}
+        
+        ring.add_node('c')
+        ring.remove_node('c')
+        
+        assert {key: ring.get_node(key) for key in keys} == before
+    
+    def test_empty_ring_raises(self):
+        with pytest.raises(ValueError, match="no nodes"):
+            ConsistentHashRing().get_node('alice')
+
+
+class TestShardRouter:
+    
+    def test_requires_at_least_one_shard(self):
+        with pytest.raises(ValueError, match="At least one shard"):
+            ShardRouter({})
+    
+    def test_each_owner_is_stored_on_exactly_one_shard(self, router, shards):
+        for owner_id in OWNERS:
+            router.create(f"{owner_id} task", "", owner_id=owner_id)
+        
+        for name, shard in shards.items():
+            assert shard.owners() == {owner for owner in OWNERS if router.shard_name_for(owner) == name}
+        assert all(shard.owners() for shard in shards.values())
+    
+    def test_owners_only_see_their_own_rows(self, router):
+        for owner_id in OWNERS:
+            for index in range(3):
+                router.create(f"{owner_id} #{index}", "", owner_id=owner_id)
+        
+        for owner_id in OWNERS:
+            titles = [row['title'] for row in router.find_all(owner_id)]
+            assert titles == [f"{owner_id} #{index}" for index in (2, 1, 0)]
+            assert router.count_all(owner_id) == 3
+    
+    def test_ids_from_another_owner_are_not_reachable(self, router):
+        alice, bob = next(
+            (a, b) for a in OWNERS for b in OWNERS if a != b and router.shard_name_for(a) == router.shard_name_for(b)
+        )
+        alice_task = router.create("Alice's", "", owner_id=alice)
+        
+        assert router.find_by_id(alice_task, bob) is None
+        assert router.update(alice_task, completed=True, owner_id=bob) is False
+        assert router.delete(alice_task, bob) is False
+        assert router.find_by_id(alice_task, alice)['completed'] is False
+    
+    def test_task_service_over_shards(self, router, shards):
+        service = TaskService(router)
+        
+        created = service.create_task("Write report", owner_id='carol')
+        service.toggle_task_completion(created['id'], 'carol')
+        
+        assert service.get_task_statistics('carol') == {'total': 1, 'completed': 1, 'active': 0}
+        assert service.get_all_tasks('dave') == []
+        assert shards[router.shard_name_for('carol')].owners() == {'carol'}
+    
+    def test_iter_scheduled_without_owner_spans_all_shards(self, router):
+        for owner_id in OWNERS:
+            router.create("Due", "", due_date='2030-01-01T09:00:00', owner_id=owner_id)
+        
+        scheduled = list(router.iter_scheduled())
+        
+        assert sorted(owner for owner, _, _ in scheduled) == sorted(OWNERS)
+    
+    def test_reassignments_list_only_owners_routed_elsewhere(self, router):
+        moves = ShardRouter.reassignments(OWNERS, SHARD_NAMES, SHARD_NAMES + ('shard-d',))
+        
+        assert moves
+        assert all(current == router.shard_name_for(owner) and new == 'shard-d'
+                   for owner, (current, new) in moves.items())
+        assert ShardRouter.reassignments(OWNERS, SHARD_NAMES, SHARD_NAMES) == {}
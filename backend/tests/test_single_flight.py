@@ -0,0 +1,133 @@
+import threading
+import pytest
+from unittest.mock import Mock
+from services.single_flight import SingleFlight
+from services.task_service import TaskService
+
+
+class BlockingLoader:
+    # Loader that holds every call open until released, counting how many ran
+    
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.result = result
+        self.error = error
+    
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(timeout=5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+    
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+    
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_for_followers(loader, threads):
+    assert loader.started.wait(timeout=5)
+    # Give the remaining threads time to join the in-flight call before releasing it
+    for thread in threads:
+        thread.join(timeout=0.05)
+
+
+class TestSingleFlight:
+    
+    def test_concurrent_callers_share_one_load(self):
+        single_flight = SingleFlight()
+        loader = BlockingLoader(result=['task'])
+        
+        threads, results, errors = run_concurrently(10, lambda: single_flight.do('alice', 'all', loader))
+        wait_for_followers(loader, threads)
+        loader.release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert loader.calls == 1
+        assert results == [['task']] * 10
+        assert single_flight.in_flight() == 0
+    
+    def test_error_is_shared_and_not_retained(self):
+        single_flight = SingleFlight()
+        loader = BlockingLoader(error=RuntimeError("db down"))
+        
+        threads, _, errors = run_concurrently(5, lambda: single_flight.do('alice', 'all', loader))
+        wait_for_followers(loader, threads)
+        loader.release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert loader.calls == 1
+        assert all(isinstance(error, RuntimeError) for error in errors)
+        assert single_flight.do('alice', 'all', lambda: 'recovered') == 'recovered'
+    
+    def test_different_keys_and_scopes_do_not_share(self):
+        single_flight = SingleFlight()
+        loader = Mock(return_value=1)
+        
+        single_flight.do('alice', 'all', loader)
+        single_flight.do('alice', 'stats', loader)
+        single_flight.do('bob', 'all', loader)
+        
+        assert loader.call_count == 3
+    
+    def test_invalidate_starts_fresh_load_for_later_callers(self):
+        single_flight = SingleFlight()
+        stale = BlockingLoader(result='stale')
+        
+        threads, results, _ = run_concurrently(1, lambda: single_flight.do('alice', 'all', stale))
+        assert stale.started.wait(timeout=5)
+        
+        single_flight.invalidate('alice')
+        assert single_flight.do('alice', 'all', lambda: 'fresh') == 'fresh'
+        
+        stale.release.set()
+        threads[0].join()
+        assert results == ['stale']
+        assert single_flight.in_flight() == 0
+
+
+class TestTaskServiceCoalescing:
+    
+    @pytest.fixture
+    def mock_repository(self):
+        return Mock()
+    
+    def test_concurrent_list_requests_issue_one_query(self, mock_repository):
+        loader = BlockingLoader(result=[{'id': 1}])
+        mock_repository.find_all.side_effect = lambda owner_id: loader()
+        service = TaskService(mock_repository)
+        
+        threads, results, _ = run_concurrently(8, service.get_all_tasks)
+        wait_for_followers(loader, threads)
+        loader.release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert mock_repository.find_all.call_count == 1
+        assert results == [[{'id': 1}]] * 8
+    
+    def test_write_invalidates_owner_reads(self, mock_repository):
+        single_flight = Mock(wraps=SingleFlight())
+        mock_repository.delete.return_value = True
+        service = TaskService(mock_repository, single_flight=single_flight)
+        
+        service.delete_task(1, 'alice')
+        
+        single_flight.invalidate.assert_called_once_with('alice')
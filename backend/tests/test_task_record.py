@@ -0,0 +1,70 @@
+import json
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from flask import Flask, jsonify
+from repositories.task_record import TaskRecord, RecordLayout, records_to_json
+
+
+COLUMNS = ('id', 'title', 'description', 'completed', 'priority', 'due_date', 'created_at')
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def make_rows():
+    return [
+        (1, 'Write "report"', 'café ☕\nline', 0, 'high', datetime(2024, 1, 2, 15, 30), datetime(2024, 1, 1)),
+        (2, 'Task 2', None, 1, 'low', None, datetime(2024, 1, 1, 8, 0, 5, tzinfo=timezone(timedelta(hours=5)))),
+    ]
+
+
+class TestTaskRecord:
+    
+    def test_behaves_like_a_read_only_mapping(self):
+        record = TaskRecord.from_rows(COLUMNS, make_rows())[0]
+        
+        assert record['id'] == 1
+        assert record.get('missing') is None
+        assert list(record) == list(COLUMNS)
+        assert len(record) == len(COLUMNS)
+        assert record.to_dict() == dict(zip(COLUMNS, make_rows()[0]))
+        with pytest.raises(TypeError):
+            record['title'] = 'changed'
+    
+    def test_records_share_one_layout_and_keep_cursor_tuples(self):
+        rows = make_rows()
+        
+        records = TaskRecord.from_rows(COLUMNS, rows)
+        
+        assert records[0]._layout is records[1]._layout
+        assert records[0]._values is rows[0]
+        assert not hasattr(records[0], '__dict__')
+    
+    def test_empty_result_builds_no_layout(self):
+        assert TaskRecord.from_rows(None, []) == []
+    
+    def test_json_matches_jsonify_of_dict_rows(self, app):
+        records = TaskRecord.from_rows(COLUMNS, make_rows())
+        dict_rows = [dict(zip(COLUMNS, row)) for row in make_rows()]
+        
+        with app.app_context():
+            assert records_to_json(records) == jsonify(dict_rows).get_data(as_text=True).strip()
+        assert json.loads(records_to_json(records))[0]['description'] == 'café ☕\nline'
+    
+    def test_encodes_other_column_types(self):
+        layout = RecordLayout(('amount', 'day', 'flag', 'ratio'))
+        
+        record = TaskRecord(layout, (Decimal('1.50'), date(2024, 1, 2), True, 0.25))
+        
+        assert json.loads(record.to_json()) == {
+            'amount': '1.50', 'day': 'Tue, 02 Jan 2024 00:00:00 GMT', 'flag': True, 'ratio': 0.25
+        }
+    
+    def test_unsupported_values_raise_type_error(self):
+        record = TaskRecord(RecordLayout(('tags',)), ({'a'},))
+        
+        with pytest.raises(TypeError):
+            record.to_json()
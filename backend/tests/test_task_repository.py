@@ -1,6 +1,8 @@
 import pytest
+from datetime import datetime
 from unittest.mock import Mock, MagicMock, call
 from repositories.task_repository import TaskRepository
+from repositories.task_record import TaskRecord
 
 
 @pytest.fixture
@@ -26,17 +28,22 @@ def repository(mock_db, mock_cursor):
 
 class TestTaskRepository:
     
-    def test_find_all_returns_all_tasks(self, repository, mock_cursor):
+    def test_find_all_returns_all_tasks(self, repository, mock_db, mock_cursor):
         expected_tasks = [
             {'id': 1, 'title': 'Task 1', 'description': 'Desc 1', 'completed': False},
             {'id': 2, 'title': 'Task 2', 'description': 'Desc 2', 'completed': True}
         ]
-        mock_cursor.fetchall.return_value = expected_tasks
+        mock_cursor.column_names = ('id', 'title', 'description', 'completed')
+        mock_cursor.fetchall.return_value = [tuple(task.values()) for task in expected_tasks]
         
         result = repository.find_all()
         
         assert result == expected_tasks
-        mock_cursor.execute.assert_called_once_with("SELECT * FROM task ORDER BY created_at DESC")
+        assert all(isinstance(task, TaskRecord) for task in result)
+        mock_db.cursor.assert_called_once_with(dictionary=False)
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT * FROM task WHERE owner_id = %s ORDER BY created_at DESC", ('default',)
+        )
         mock_cursor.close.assert_called_once()
     
     def test_find_by_id_returns_task_when_found(self, repository, mock_cursor):
@@ -46,7 +53,9 @@ class TestTaskRepository:
         result = repository.find_by_id(1)
         
         assert result == expected_task
-        mock_cursor.execute.assert_called_once_with("SELECT * FROM task WHERE id = %s", (1,))
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT * FROM task WHERE id = %s AND owner_id = %s", (1, 'default')
+        )
         mock_cursor.close.assert_called_once()
     
     def test_find_by_id_returns_none_when_not_found(self, repository, mock_cursor):
@@ -60,12 +69,13 @@ class TestTaskRepository:
     def test_create_inserts_task_and_returns_id(self, repository, mock_cursor, mock_db):
         mock_cursor.lastrowid = 42
         
-        result = repository.create("New Task", "Description", False)
+        result = repository.create("New Task", "Description", False, owner_id='alice')
         
         assert result == 42
         mock_cursor.execute.assert_called_once_with(
-            "INSERT INTO task (title, description, completed) VALUES (%s, %s, %s)",
-            ("New Task", "Description", False)
+            "INSERT INTO task (owner_id, title, description, completed, priority, due_date) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            ('alice', "New Task", "Description", False, 'normal', None)
         )
         mock_db.commit.assert_called_once()
         mock_cursor.close.assert_called_once()
@@ -89,7 +99,8 @@ class TestTaskRepository:
         mock_cursor.execute.assert_called_once()
         call_args = mock_cursor.execute.call_args[0]
         assert "completed = %s" in call_args[0]
-        assert call_args[1] == (True, 1)
+        assert "completed_at = IF(completed, COALESCE(completed_at, NOW()), NULL)" in call_args[0]
+        assert call_args[1] == (True, 1, 'default')
     
     def test_update_returns_false_when_no_fields(self, repository, mock_cursor):
         result = repository.update(1)
@@ -110,7 +121,9 @@ class TestTaskRepository:
         result = repository.delete(1)
         
         assert result is True
-        mock_cursor.execute.assert_called_once_with("DELETE FROM task WHERE id = %s", (1,))
+        mock_cursor.execute.assert_called_once_with(
+            "DELETE FROM task WHERE id = %s AND owner_id = %s", (1, 'default')
+        )
         mock_db.commit.assert_called_once()
     
     def test_delete_returns_false_when_not_found(self, repository, mock_cursor):
@@ -126,7 +139,9 @@ class TestTaskRepository:
         result = repository.count_all()
         
         assert result == 5
-        mock_cursor.execute.assert_called_once_with("SELECT COUNT(*) as count FROM task")
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT COUNT(*) as count FROM task WHERE owner_id = %s", ('default',)
+        )
     
     def test_count_by_status_completed(self, repository, mock_cursor):
         mock_cursor.fetchone.return_value = {'count': 3}
@@ -135,7 +150,8 @@ class TestTaskRepository:
         
         assert result == 3
         mock_cursor.execute.assert_called_once_with(
-            "SELECT COUNT(*) as count FROM task WHERE completed = %s", (True,)
+            "SELECT COUNT(*) as count FROM task WHERE owner_id = %s AND completed = %s",
+            ('default', True)
         )
     
     def test_count_by_status_active(self, repository, mock_cursor):
@@ -144,3 +160,126 @@ class TestTaskRepository:
         result = repository.count_by_status(False)
         
         assert result == 2
+    
+    def test_queries_are_scoped_to_owner(self, repository, mock_cursor):
+        mock_cursor.fetchone.return_value = {'count': 1}
+        
+        repository.find_all('alice')
+        repository.count_by_status(False, 'alice')
+        
+        for executed in mock_cursor.execute.call_args_list:
+            assert "owner_id = %s" in executed[0][0]
+            assert 'alice' in executed[0][1]
+    
+    def test_iter_all_pages_by_id(self, repository, mock_cursor):
+        mock_cursor.fetchall.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+        
+        result = list(repository.iter_all('alice', batch_size=2))
+        
+        assert result == [{'id': 1}, {'id': 2}, {'id': 3}]
+        query = "SELECT * FROM task WHERE owner_id = %s AND id > %s ORDER BY id LIMIT %s"
+        assert mock_cursor.execute.call_args_list == [call(query, ('alice', 0, 2)), call(query, ('alice', 2, 2))]
+        assert mock_cursor.close.call_count == 2
+    
+    def test_iter_all_closes_cursor_between_pages(self, repository, mock_cursor):
+        mock_cursor.fetchall.side_effect = [[{'id': 1}, {'id': 2}], []]
+        
+        rows = repository.iter_all('alice', batch_size=2)
+        next(rows)
+        
+        mock_cursor.close.assert_called_once()
+        assert list(rows) == [{'id': 2}]
+    
+    def test_bulk_create_inserts_all_rows_in_one_statement(self, repository, mock_cursor, mock_db):
+        mock_cursor.rowcount = 2
+        mock_cursor.lastrowid = 7
+        mock_cursor.fetchone.return_value = {'step': 1}
+        rows = [
+            ("A", "", False, 'low', None, None, None, None),
+            ("B", "desc", True, 'normal', '2024-01-01 00:00:00', '2023-12-01 08:00:00', '2023-12-02 09:00:00',
+             '2023-12-02 09:00:00'),
+        ]
+        
+        result = repository.bulk_create(rows, 'alice')
+        
+        assert result == [7, 8]
+        mock_cursor.executemany.assert_called_once_with(
+            "INSERT INTO task (owner_id, title, description, completed, priority, due_date, "
+            "created_at, updated_at, completed_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP), "
+            "COALESCE(%s, created_at), IF(completed, COALESCE(%s, updated_at), NULL))",
+            [('alice',) + rows[0], ('alice',) + rows[1]]
+        )
+        mock_db.commit.assert_called_once()
+    
+    def test_bulk_create_steps_ids_by_auto_increment_increment(self, repository, mock_cursor):
+        mock_cursor.rowcount = 3
+        mock_cursor.lastrowid = 11
+        mock_cursor.fetchone.return_value = {'step': 10}
+        rows = [("A", "", False, 'low', None, None, None, None)] * 3
+        
+        assert repository.bulk_create(rows, 'alice') == [11, 21, 31]
+        mock_cursor.execute.assert_called_once_with("SELECT @@auto_increment_increment AS step")
+    
+    def test_bulk_create_with_no_rows_skips_database(self, repository, mock_db):
+        assert repository.bulk_create([]) == []
+        mock_db.cursor.assert_not_called()
+    
+    def test_find_updated_since_filters_on_watermark(self, repository, mock_cursor):
+        since = datetime(2024, 1, 1)
+        
+        repository.find_updated_since('alice', since)
+        
+        query, params = mock_cursor.execute.call_args[0]
+        assert query.endswith("WHERE owner_id = %s AND updated_at >= %s")
+        assert params == ('alice', since)
+    
+    def test_find_updated_since_without_watermark_reads_all(self, repository, mock_cursor):
+        repository.find_updated_since('alice')
+        
+        query, params = mock_cursor.execute.call_args[0]
+        assert "updated_at" not in query.split("WHERE")[1]
+        assert params == ('alice',)
+    
+    def test_find_due_between_uses_open_task_range(self, repository, mock_cursor):
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 2)
+        
+        repository.find_due_between('alice', start, end)
+        
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT * FROM task WHERE owner_id = %s AND completed = FALSE "
+            "AND due_date >= %s AND due_date < %s ORDER BY due_date",
+            ('alice', start, end)
+        )
+    
+    def test_find_overdue(self, repository, mock_cursor):
+        now = datetime(2024, 1, 1)
+        
+        repository.find_overdue('alice', now)
+        
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT * FROM task WHERE owner_id = %s AND completed = FALSE "
+            "AND due_date < %s ORDER BY due_date",
+            ('alice', now)
+        )
+    
+    def test_iter_scheduled_yields_owner_id_and_due_date(self, repository, mock_cursor):
+        due = datetime(2024, 1, 1)
+        mock_cursor.fetchmany.side_effect = [[{'owner_id': 'alice', 'id': 1, 'due_date': due}], []]
+        
+        result = list(repository.iter_scheduled())
+        
+        assert result == [('alice', 1, due)]
+        assert mock_cursor.execute.call_args[0][1] == ()
+    
+    def test_find_snapshot_rows_batches_ids(self, repository, mock_cursor):
+        mock_cursor.fetchall.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+        
+        result = repository.find_snapshot_rows('alice', [1, 2, 3], batch_size=2)
+        
+        assert result == [{'id': 1}, {'id': 2}, {'id': 3}]
+        first_query, first_params = mock_cursor.execute.call_args_list[0][0]
+        assert first_query.endswith("WHERE owner_id = %s AND id IN (%s, %s)")
+        assert first_params == ('alice', 1, 2)
+        assert mock_cursor.execute.call_args_list[1][0][1] == ('alice', 3)
+        mock_cursor.close.assert_called_once()
@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime, timedelta
 from unittest.mock import Mock
 from services.task_service import TaskService
 
@@ -31,7 +32,7 @@ class TestTaskService:
         result = service.get_task_by_id(1)
         
         assert result == expected_task
-        mock_repository.find_by_id.assert_called_once_with(1)
+        mock_repository.find_by_id.assert_called_once_with(1, 'default')
     
     def test_create_task_success(self, service, mock_repository):
         created_task = {'id': 1, 'title': 'New Task', 'description': 'Description'}
@@ -46,7 +47,8 @@ class TestTaskService:
             description="Description",
             completed=False,
             priority='normal',
-            due_date=None
+            due_date=None,
+            owner_id='default'
         )
     
     def test_create_task_trims_whitespace(self, service, mock_repository):
@@ -60,7 +62,8 @@ class TestTaskService:
             description="Spaced Description",
             completed=False,
             priority='normal',
-            due_date=None
+            due_date=None,
+            owner_id='default'
         )
     
     def test_create_task_fails_with_empty_title(self, service, mock_repository):
@@ -100,7 +103,8 @@ class TestTaskService:
             description=None,
             completed=True,
             priority=None,
-            due_date=None
+            due_date=None,
+            owner_id='default'
         )
     
     def test_update_task_returns_none_when_not_found(self, service, mock_repository):
@@ -125,7 +129,7 @@ class TestTaskService:
         result = service.toggle_task_completion(1)
         
         assert result == toggled_task
-        mock_repository.update.assert_called_once_with(1, completed=True)
+        mock_repository.update.assert_called_once_with(1, completed=True, owner_id='default')
     
     def test_toggle_task_completion_returns_none_when_not_found(self, service, mock_repository):
         mock_repository.find_by_id.return_value = None
@@ -141,7 +145,7 @@ class TestTaskService:
         result = service.delete_task(1)
         
         assert result is True
-        mock_repository.delete.assert_called_once_with(1)
+        mock_repository.delete.assert_called_once_with(1, 'default')
     
     def test_delete_task_returns_false_when_not_found(self, service, mock_repository):
         mock_repository.delete.return_value = False
@@ -163,3 +167,169 @@ class TestTaskService:
         }
         mock_repository.count_all.assert_called_once()
         assert mock_repository.count_by_status.call_count == 2
+    
+    def test_get_task_statistics_scoped_to_owner(self, service, mock_repository):
+        mock_repository.count_all.return_value = 1
+        mock_repository.count_by_status.side_effect = [0, 1]
+        
+        service.get_task_statistics('alice')
+        
+        mock_repository.count_all.assert_called_once_with('alice')
+        mock_repository.count_by_status.assert_any_call(True, 'alice')
+        mock_repository.count_by_status.assert_any_call(False, 'alice')
+    
+    def test_import_tasks_inserts_valid_rows_in_chunks(self, service, mock_repository):
+        mock_repository.bulk_create.side_effect = lambda rows, owner_id: list(range(1, len(rows) + 1))
+        rows = [(line, {'title': f"Task {line}"}) for line in range(1, 6)]
+        
+        events = list(service.import_tasks(rows, 'alice', chunk_size=2))
+        
+        assert mock_repository.bulk_create.call_count == 3
+        assert [event['type'] for event in events] == ['progress', 'progress', 'summary']
+        assert events[-1] == {'type': 'summary', 'processed': 5, 'imported': 5, 'failed': 0}
+    
+    def test_import_tasks_reports_invalid_rows(self, service, mock_repository):
+        mock_repository.bulk_create.side_effect = lambda rows, owner_id: list(range(1, len(rows) + 1))
+        rows = [
+            (2, {'title': 'Good', 'completed': 'true', 'due_date': '2024-05-01'}),
+            (3, {'title': ''}),
+            (4, {'title': 'Bad priority', 'priority': 'high'}),
+            (5, ValueError("Invalid JSON")),
+            (6, {'title': 'Bad date', 'due_date': 'tomorrow'}),
+        ]
+        
+        events = list(service.import_tasks(rows))
+        
+        errors = [(event['row'], event['error']) for event in events if event['type'] == 'error']
+        assert errors == [
+            (3, "Task title is required"),
+            (4, "Priority must be 'low', 'normal', or 'urgent'"),
+            (5, "Invalid JSON"),
+            (6, "Due date must be an ISO 8601 date or datetime"),
+        ]
+        mock_repository.bulk_create.assert_called_once_with(
+            [('Good', '', True, 'normal', '2024-05-01 00:00:00', None, None, None)], 'default'
+        )
+        assert events[-1] == {'type': 'summary', 'processed': 5, 'imported': 1, 'failed': 4}
+    
+    def test_import_tasks_restores_exported_timestamps(self, service, mock_repository):
+        mock_repository.bulk_create.side_effect = lambda rows, owner_id: list(range(1, len(rows) + 1))
+        rows = [
+            (2, {'title': 'Done', 'completed': 'true', 'created_at': '2023-03-01T08:00:00',
+                 'updated_at': '2023-03-04T10:00:00', 'completed_at': '2023-03-04T10:00:00'}),
+            (3, {'title': 'Open', 'completed': 'false', 'created_at': '2023-03-02T08:00:00',
+                 'updated_at': '2023-03-02T08:00:00', 'completed_at': '2023-03-03T08:00:00'}),
+        ]
+        
+        list(service.import_tasks(rows, 'alice'))
+        
+        mock_repository.bulk_create.assert_called_once_with([
+            ('Done', '', True, 'normal', None, '2023-03-01 08:00:00', '2023-03-04 10:00:00', '2023-03-04 10:00:00'),
+            ('Open', '', False, 'normal', None, '2023-03-02 08:00:00', '2023-03-02 08:00:00', None),
+        ], 'alice')
+    
+    def test_import_tasks_validates_timestamps(self, service, mock_repository):
+        rows = [
+            (2, {'title': 'A', 'created_at': 'yesterday'}),
+            (3, {'title': 'B', 'updated_at': '1960-01-01'}),
+            (4, {'title': 'C', 'completed': 'true', 'completed_at': 'soon'}),
+        ]
+        
+        events = list(service.import_tasks(rows))
+        
+        assert [(event['row'], event['error']) for event in events if event['type'] == 'error'] == [
+            (2, "Created at must be an ISO 8601 date or datetime"),
+            (3, "Updated at must be between 1970 and 2038"),
+            (4, "Completed at must be an ISO 8601 date or datetime"),
+        ]
+        mock_repository.bulk_create.assert_not_called()
+    
+    def test_export_tasks_streams_from_repository(self, service, mock_repository):
+        mock_repository.iter_all.return_value = iter([{'id': 1}])
+        
+        result = list(service.export_tasks('alice', batch_size=50))
+        
+        assert result == [{'id': 1}]
+        mock_repository.iter_all.assert_called_once_with('alice', 50)
+    
+    def test_get_due_tasks_queries_window_from_now(self, service, mock_repository):
+        now = datetime(2024, 1, 1, 12)
+        
+        service.get_due_tasks(timedelta(hours=6), 'alice', now=now)
+        
+        mock_repository.find_due_between.assert_called_once_with('alice', now, datetime(2024, 1, 1, 18))
+    
+    def test_get_due_tasks_rejects_non_positive_window(self, service, mock_repository):
+        with pytest.raises(ValueError, match="Due window must be positive"):
+            service.get_due_tasks(timedelta(0))
+    
+    def test_get_overdue_tasks(self, service, mock_repository):
+        now = datetime(2024, 1, 1, 12)
+        
+        service.get_overdue_tasks('alice', now=now)
+        
+        mock_repository.find_overdue.assert_called_once_with('alice', now)
+
+
+class TestTaskServiceScheduling:
+    
+    @pytest.fixture
+    def scheduler(self):
+        return Mock()
+    
+    @pytest.fixture
+    def service(self, mock_repository, scheduler):
+        return TaskService(mock_repository, scheduler)
+    
+    def test_create_task_schedules_due_date(self, service, mock_repository, scheduler):
+        mock_repository.create.return_value = 5
+        mock_repository.find_by_id.return_value = {'id': 5, 'due_date': '2024-02-01T10:00', 'completed': 0}
+        
+        service.create_task("Task", due_date='2024-02-01T10:00', owner_id='alice')
+        
+        scheduler.schedule.assert_called_once_with('alice', 5, '2024-02-01T10:00', False)
+    
+    def test_completing_task_reschedules_as_completed(self, service, mock_repository, scheduler):
+        mock_repository.find_by_id.side_effect = [
+            {'id': 1, 'completed': False}, {'id': 1, 'completed': True, 'due_date': None}
+        ]
+        
+        service.toggle_task_completion(1)
+        
+        scheduler.schedule.assert_called_once_with('default', 1, None, True)
+    
+    def test_update_task_reschedules(self, service, mock_repository, scheduler):
+        mock_repository.find_by_id.side_effect = [{'id': 1}, {'id': 1, 'due_date': '2024-03-01', 'completed': 0}]
+        mock_repository.update.return_value = True
+        
+        service.update_task(1, due_date='2024-03-01')
+        
+        scheduler.schedule.assert_called_once_with('default', 1, '2024-03-01', False)
+    
+    def test_delete_task_unschedules(self, service, mock_repository, scheduler):
+        mock_repository.delete.return_value = True
+        
+        service.delete_task(3, 'alice')
+        
+        scheduler.unschedule.assert_called_once_with('alice', 3)
+    
+    def test_failed_delete_leaves_schedule(self, service, mock_repository, scheduler):
+        mock_repository.delete.return_value = False
+        
+        service.delete_task(3, 'alice')
+        
+        scheduler.unschedule.assert_not_called()
+    
+    def test_import_schedules_only_new_open_tasks(self, service, mock_repository, scheduler):
+        mock_repository.bulk_create.side_effect = lambda rows, owner_id: [41, 42, 43]
+        rows = [
+            (1, {'title': 'A', 'due_date': '2024-02-01'}),
+            (2, {'title': 'B', 'due_date': '2024-02-02', 'completed': 'true'}),
+            (3, {'title': 'C'}),
+        ]
+        
+        list(service.import_tasks(rows, 'alice'))
+        
+        mock_repository.iter_scheduled.assert_not_called()
+        (loaded,), _ = scheduler.load.call_args
+        assert list(loaded) == [('alice', 41, '2024-02-01 00:00:00')]
@@ -0,0 +1,122 @@
+import io
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from flask import Flask
+from controllers.task_controller import TaskController, MAX_TRANSFER_BATCH
+from services import task_transfer
+from services.task_service import TaskService
+
+
+TASK = {
+    'id': 7, 'title': 'Write, report', 'description': 'Line one\nLine two', 'completed': 1,
+    'priority': 'urgent', 'due_date': datetime(2024, 5, 1, 9, 30), 'owner_id': 'alice',
+    'created_at': datetime(2024, 4, 1), 'updated_at': datetime(2024, 4, 2),
+    'completed_at': datetime(2024, 4, 2),
+}
+
+
+@pytest.fixture
+def repository():
+    repository = Mock()
+    repository.iter_all.return_value = iter([TASK])
+    repository.bulk_create.side_effect = lambda rows, owner_id: list(range(1, len(rows) + 1))
+    return repository
+
+
+@pytest.fixture
+def client(repository):
+    app = Flask(__name__)
+    app.register_blueprint(TaskController(TaskService(repository)).blueprint)
+    return app.test_client()
+
+
+class TestTaskTransfer:
+    
+    def test_write_ndjson_emits_one_object_per_line(self):
+        lines = list(task_transfer.write_ndjson([TASK, TASK]))
+        
+        assert len(lines) == 2
+        record = json.loads(lines[0])
+        assert list(record) == task_transfer.EXPORT_COLUMNS
+        assert record['completed'] is True
+        assert record['due_date'] == '2024-05-01T09:30:00'
+    
+    def test_write_csv_flushes_in_chunks(self):
+        chunks = list(task_transfer.write_csv([TASK] * 5, rows_per_chunk=2))
+        
+        assert len(chunks) == 3
+        assert chunks[0].startswith(','.join(task_transfer.EXPORT_COLUMNS))
+    
+    def test_write_csv_with_no_tasks_emits_header(self):
+        assert list(task_transfer.write_csv([])) == [','.join(task_transfer.EXPORT_COLUMNS) + '\r\n']
+    
+    def test_csv_round_trip_preserves_fields(self):
+        exported = ''.join(task_transfer.write_csv([TASK]))
+        
+        rows = list(task_transfer.read_csv(io.StringIO(exported, newline='')))
+        
+        assert len(rows) == 1
+        line_number, row = rows[0]
+        assert line_number == 3
+        assert row['title'] == 'Write, report'
+        assert row['description'] == 'Line one\nLine two'
+        assert row['completed'] == 'true'
+    
+    def test_export_then_import_keeps_timestamps(self, repository):
+        exported = ''.join(task_transfer.write_ndjson([TASK]))
+        
+        list(TaskService(repository).import_tasks(task_transfer.read_ndjson(io.StringIO(exported))))
+        
+        (row,), owner_id = repository.bulk_create.call_args.args
+        assert row[5:] == ('2024-04-01 00:00:00', '2024-04-02 00:00:00', '2024-04-02 00:00:00')
+    
+    def test_read_csv_requires_title_column(self):
+        rows = list(task_transfer.read_csv(io.StringIO("name,priority\nA,low\n")))
+        
+        assert len(rows) == 1
+        assert isinstance(rows[0][1], ValueError)
+    
+    def test_read_csv_flags_rows_with_extra_fields(self):
+        rows = list(task_transfer.read_csv(io.StringIO("title\nA\nB,extra\n")))
+        
+        assert rows[0] == (2, {'title': 'A'})
+        assert isinstance(rows[1][1], ValueError)
+    
+    def test_read_ndjson_reports_bad_lines_and_skips_blank_ones(self):
+        stream = io.StringIO('{"title": "A"}\n\nnot json\n[1, 2]\n{"title": "B"}\n')
+        
+        rows = list(task_transfer.read_ndjson(stream))
+        
+        assert [line for line, _ in rows] == [1, 3, 4, 5]
+        assert rows[0][1] == {'title': 'A'}
+        assert isinstance(rows[1][1], ValueError)
+        assert isinstance(rows[2][1], ValueError)
+        assert rows[3][1] == {'title': 'B'}
+
+
+class TestTransferEndpoints:
+    
+    def test_export_batch_size_is_capped(self, client, repository):
+        response = client.get('/tasks/export?batch_size=1000000')
+        
+        assert response.status_code == 200
+        repository.iter_all.assert_called_once_with('default', MAX_TRANSFER_BATCH)
+    
+    def test_import_chunk_size_is_capped(self, client, repository):
+        body = 'title\n' + 'Task\n' * (MAX_TRANSFER_BATCH + 1)
+        
+        response = client.post('/tasks/import?chunk_size=1000000', data=body, content_type='text/csv')
+        
+        summary = json.loads(response.get_data(as_text=True).splitlines()[-1])
+        assert summary['imported'] == MAX_TRANSFER_BATCH + 1
+        assert [len(call.args[0]) for call in repository.bulk_create.call_args_list] == [MAX_TRANSFER_BATCH, 1]
+    
+    def test_import_accepts_csv_with_byte_order_mark(self, client, repository):
+        body = '\ufefftitle,priority\nFrom Excel,low\n'.encode('utf-8')
+        
+        response = client.post('/tasks/import', data=body, content_type='text/csv')
+        
+        summary = json.loads(response.get_data(as_text=True).splitlines()[-1])
+        assert summary == {'type': 'summary', 'processed': 1, 'imported': 1, 'failed': 0}
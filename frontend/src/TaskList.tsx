@@ -24,6 +24,28 @@ interface Task {
   updated_at: string;
 }
 
+// Reads may be served by a replica; sending back the token from our last write keeps them
+// on the primary until the replicas have caught up with that write
+const SESSION_HEADER = 'X-Session-Token';
+let sessionToken: string | null = null;
+
+const api = axios.create();
+
+api.interceptors.request.use((config) => {
+  if (sessionToken) {
+    config.headers.set(SESSION_HEADER, sessionToken);
+  }
+  return config;
+});
+
+api.interceptors.response.use((response) => {
+  const token = response.headers[SESSION_HEADER.toLowerCase()];
+  if (typeof token === 'string' && token) {
+    sessionToken = token;
+  }
+  return response;
+});
+
 type FilterType = 'all' | 'active' | 'completed';
 type PriorityType = 'low' | 'normal' | 'urgent';
 
@@ -48,7 +70,7 @@ const TaskList: React.FC = () => {
 
   const fetchTasks = async () => {
     try {
-      const res = await axios.get('http://localhost:5000/tasks');
+      const res = await api.get('http://localhost:5000/tasks');
       setTasks(res.data);
     } catch (error) {
       console.error('Error fetching tasks:', error);
@@ -70,7 +92,7 @@ const TaskList: React.FC = () => {
 
     setLoading(true);
     try {
-      await axios.post('http://localhost:5000/tasks', { 
+      await api.post('http://localhost:5000/tasks', { 
         title: title.trim(), 
         description: description.trim(),
         priority,
@@ -101,7 +123,7 @@ const TaskList: React.FC = () => {
     if (!editingTask) return;
 
     try {
-      await axios.put(`http://localhost:5000/tasks/${editingTask.id}`, taskData);
+      await api.put(`http://localhost:5000/tasks/${editingTask.id}`, taskData);
       await fetchTasks();
       setShowEditModal(false);
       setEditingTask(null);
@@ -121,7 +143,7 @@ const TaskList: React.FC = () => {
 
   const toggleTask = async (task: Task) => {
     try {
-      await axios.put(`http://localhost:5000/tasks/${task.id}`, { 
+      await api.put(`http://localhost:5000/tasks/${task.id}`, { 
         completed: !task.completed 
       });
       await fetchTasks();
@@ -165,7 +187,7 @@ const TaskList: React.FC = () => {
             onClick={async () => {
               toast.dismiss();
               try {
-                await axios.delete(`http://localhost:5000/tasks/${id}`);
+                await api.delete(`http://localhost:5000/tasks/${id}`);
                 await fetchTasks();
                 toast.success('Task deleted successfully! ', {
                   position: 'top-right',